@@ -1,33 +1,282 @@
+import time
+STARTUP_START = time.perf_counter()  # Taken before the remaining imports so --profile-startup can time them
+import abc
+import argparse
+import array
+import asyncio
+import atexit
+import bisect
+import csv
 import customtkinter as ctk
+import hashlib
+import heapq
+import importlib
+import itertools
 import ipaddress
+import json
 import os
+import re
 import logging
-import netmiko
-import pandas as pd
-import paramiko
+import logging.handlers
 import threading
-import time
 import queue as q
+import select
+import shutil
 import socket
-from PIL import Image
+import struct
+import tempfile
+from collections import OrderedDict
+from concurrent.futures import CancelledError, FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager
 from platform import system
-from tkinter import filedialog, scrolledtext
+from tkinter import filedialog, scrolledtext, ttk
 # Static Variables
 PAD_X = 5
 PAD_Y = 5
 CORNER_RADIUS = 5
+SSH_PORT = 22
+SSH_TIMEOUT = 3
+DEFAULT_SWEEP_CONCURRENCY = 64
+DEFAULT_PROBE_CONCURRENCY = 512
+PROBE_TIMEOUT = SSH_TIMEOUT
+SWEEP_DONE = None  # Queue sentinel marking the end of the device list
+SWEEP_QUEUE_SIZE = 1000  # Bound on parsed-but-unchecked devices, keeps memory flat for any CSV size
+PROGRESS_INTERVAL_MS = 250  # How often the Tk main loop drains sweep progress
+RESULT_BATCH_SIZE = 500  # Sweep results buffered before they are appended to the results file
+RESULT_FLUSH_INTERVAL = 5  # Seconds before a partial batch is written anyway
+JOURNAL_SCAN_BYTES = 4096  # Block read backwards when trimming a torn journal line
+FAN_OUT_WORKERS = 16  # Devices App2Frame talks to at once in fan-out mode
+SESSION_POOL_SIZE = 32  # Authenticated netmiko sessions App2Frame keeps open
+SESSION_IDLE_TIMEOUT = 600  # Seconds an unused pooled session is kept
+SESSION_KEEPALIVE = 30  # Seconds between SSH keepalives on pooled sessions
+COMMAND_TIMEOUT = 120  # Seconds a queued App2Frame command may wait and run before it is abandoned
+QUEUE_POLL_MS = 250  # How often App2Frame refreshes the command queue depth
+STREAM_READ_TIMEOUT = 60  # Seconds without new output before a streamed command is abandoned
+CONNECT_TIMEOUT = 15  # Seconds netmiko allows each of TCP connect, SSH banner and authentication
+CONNECT_DEADLINE = 60  # Seconds before App2Frame gives up on a login that has not finished
+DISCONNECT_TIMEOUT = 10  # Seconds App2Frame waits for a disconnect before treating the session as gone
+STATE_POLL_MS = 50  # How often App2Frame applies connection state changes from the session workers
+# Seconds a parsed command result is reused, matched by command prefix; commands not listed are never cached
+COMMAND_CACHE_TTLS = {
+    "sh version": 3600,
+    "sh int desc": 300,
+    "sh cdp nei": 300,
+}
+CONSOLE_MAX_LINES = 5000  # Lines kept in the App2Frame output pane; older lines only live in the history file
+CONSOLE_FLUSH_MS = 33  # Queued output is inserted once per frame
+CONSOLE_HISTORY_FILE = "Logs/console_history.log"
+LOG_FILE = "Logs/log.log"
+LOG_MAX_BYTES = 5 * 1024 * 1024  # Rotate Logs/log.log at this size
+LOG_BACKUP_COUNT = 5
+LOG_BATCH_SIZE = 200  # Records written before the log file is flushed
+LOG_FLUSH_INTERVAL = 2  # Seconds before a partial batch is flushed anyway
+DEVICE_COLUMNS = ["Device_Name", "IP_Address"]
+KNOWN_HOSTS_FILE = "known_hosts"  # Host keys learned during sweeps and App2Frame sessions, OpenSSH format
+# Tried first when "Prefer fast SSH algorithms" is ticked; anything else the device offers stays as a fallback
+FAST_KEX = ("curve25519-sha256", "curve25519-sha256@libssh.org", "ecdh-sha2-nistp256")
+FAST_CIPHERS = ("aes128-gcm@openssh.com", "aes128-ctr", "aes256-ctr")
+INVENTORY_FILES = ("inventory.csv", "inventory.json")  # Loaded on first use; the sample sites are used otherwise
+SAMPLE_INVENTORY = [{"Device_Name": f"Site{site} {role}", "IP_Address": f"10.{site}.{octet}.11",
+                     "Site": f"Site{site}", "Role": role}
+                    for site in range(1, 5) for role, octet in (("Core", 100), ("WLC", 200))]
+SITE_MENU_LIMIT = 50  # Matching sites shown in App2Frame's site menu at once
+TARGET_LIST_LIMIT = 200  # Devices listed at once in the fan-out target picker
+TYPE_AHEAD_MS = 150  # Pause in typing before a filter is applied
+PREFIX_PAGE_SIZE = 500  # Rows App3Frame's prefix tools insert into their table at a time
+HOST_EXPORT_COUNT = 65536  # Default number of addresses exported from the host list
+CAPTURE_SNAPLEN = 128  # Bytes kept from each frame, enough for Ethernet, VLAN and IPv4/IPv6 headers
+CAPTURE_RING_SLOTS = 65536  # Frames the capture ring holds between aggregator passes
+CAPTURE_CHUNK = 4096  # Frames the aggregator copies out of the ring and counts before advancing its read position
+CAPTURE_SOCKET_BUFFER = 32 * 1024 * 1024  # Kernel receive buffer requested for live capture, absorbs bursts
+CAPTURE_REFRESH_MS = 500  # How often App4Frame redraws its counters
+CAPTURE_TOP_TALKERS = 10
+CAPTURE_TALKER_LIMIT = 100000  # Sources tracked before the lightest half is dropped
+ETH_P_ALL = 0x0003  # Linux constants not exposed by the socket module
+SOL_PACKET = 263
+PACKET_STATISTICS = 6
+UNPACK_U16 = struct.Struct("!H").unpack_from
+UNPACK_U32 = struct.Struct("!I").unpack_from
+UNPACK_U64_PAIR = struct.Struct("!QQ").unpack_from
 ctk.set_appearance_mode("dark")
-images = [
-            ctk.CTkImage(Image.open('Images/hide.png'), size=(26, 26)),
-            ctk.CTkImage(Image.open('Images/show.png'), size=(26, 26))
-]
-logging.basicConfig(
-            filename="Logs/log.log",
-            filemode="a",
-            format="{asctime} - {levelname} - {message}",
-            style="{",
-            datefmt="%Y-%m-%d %H:%M"
-        )
+
+
+class StartupProfiler:
+    """Collects how long imports and frame construction take. Only prints when --profile-startup is given."""
+
+    def __init__(self):
+        self.enabled = False
+        self.reported = False
+        self.timings = []
+
+    def record(self, label, seconds):
+        self.timings.append((label, seconds))
+        if self.enabled and self.reported:
+            # Anything loaded after the first report (e.g. an applet opened later) is printed as it happens
+            print(f"[profile] {label:<28}{seconds * 1000:9.1f}ms")
+
+    @contextmanager
+    def measure(self, label):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(label, time.perf_counter() - start)
+
+    def report(self):
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        print("[profile] Startup")
+        for label, seconds in self.timings:
+            print(f"[profile] {label:<28}{seconds * 1000:9.1f}ms")
+        print(f"[profile] {'window ready':<28}{(time.perf_counter() - STARTUP_START) * 1000:9.1f}ms")
+
+
+class LazyModule:
+    """Stands in for a heavy module and imports it the first time one of its attributes is used."""
+
+    def __init__(self, name):
+        self.name = name
+        self.module = None
+        self.preloading = False
+
+    def load(self):
+        if self.module is None:
+            with startup_profiler.measure(f"import {self.name}"):
+                self.module = importlib.import_module(self.name)
+        return self.module
+
+    def preload(self):
+        """Imports the module on a background thread so the applet that needs it stays responsive."""
+        if self.module is None and not self.preloading:
+            self.preloading = True
+            threading.Thread(target=self.load, daemon=True).start()
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+
+startup_profiler = StartupProfiler()
+startup_profiler.record("eager imports", time.perf_counter() - STARTUP_START)
+netmiko = LazyModule("netmiko")
+paramiko = LazyModule("paramiko")
+pil_image = LazyModule("PIL.Image")
+pyarrow = LazyModule("pyarrow")
+netmiko_utilities = LazyModule("netmiko.utilities")
+textfsm = LazyModule("textfsm")
+clitable = LazyModule("textfsm.clitable")
+pyarrow_parquet = LazyModule("pyarrow.parquet")
+numpy = LazyModule("numpy")  # Optional, speeds up App3Frame's batch calculations
+images = []
+
+
+def get_images():
+    """Loads the show/hide password icons on first use."""
+    if not images:
+        with startup_profiler.measure("load images"):
+            images.extend([
+                ctk.CTkImage(pil_image.open('Images/hide.png'), size=(26, 26)),
+                ctk.CTkImage(pil_image.open('Images/show.png'), size=(26, 26))
+            ])
+    return images
+
+
+def memory_usage():
+    """Resident memory of this process in bytes, or None where /proc is not available."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def format_memory(size):
+    return "n/a" if size is None else f"{size / 1024 / 1024:.1f} MB"
+
+
+class BatchingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Size-rotated log file that flushes every `batch_size` records or `flush_interval` seconds
+    instead of after every record."""
+
+    def __init__(self, filename, batch_size=LOG_BATCH_SIZE, flush_interval=LOG_FLUSH_INTERVAL, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending = 0
+        self.last_flush = time.monotonic()
+
+    def emit(self, record):
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+            self.pending += 1
+            if self.pending >= self.batch_size or time.monotonic() - self.last_flush >= self.flush_interval:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        super().flush()
+        self.pending = 0
+        self.last_flush = time.monotonic()
+
+
+class FlushingQueueListener(logging.handlers.QueueListener):
+    """QueueListener that flushes its handlers once the queue has been idle for `flush_interval` seconds,
+    so a batch left behind by the last burst of records reaches the file without waiting for another one."""
+
+    def __init__(self, queue, *handlers, flush_interval=LOG_FLUSH_INTERVAL):
+        super().__init__(queue, *handlers)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block):
+        try:
+            return self.queue.get(block, self.flush_interval)
+        except q.Empty:
+            for handler in self.handlers:
+                handler.flush()
+            return self.queue.get(block)
+
+
+class LogContextFilter(logging.Filter):
+    """Renders the optional host/phase/elapsed fields passed through `extra=log_context(...)`."""
+
+    def filter(self, record):
+        fields = []
+        if getattr(record, "host", None):
+            fields.append(f"host={record.host}")
+        if getattr(record, "phase", None):
+            fields.append(f"phase={record.phase}")
+        if getattr(record, "elapsed", None) is not None:
+            fields.append(f"elapsed={record.elapsed * 1000:.0f}ms")
+        record.context = f" [{' '.join(fields)}]" if fields else ""
+        return True
+
+
+def log_context(host, phase, elapsed=None):
+    return {"host": host, "phase": phase, "elapsed": elapsed}
+
+
+def setup_logging():
+    """Sends every record through a queue to a listener thread that owns the log file.
+
+    Worker threads only pay for a queue put; formatting, file writes and rotation happen on the listener."""
+    file_handler = BatchingRotatingFileHandler(LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT)
+    file_handler.addFilter(LogContextFilter())
+    file_handler.setFormatter(logging.Formatter("{asctime} - {levelname} - {message}{context}", style="{",
+                                                datefmt="%Y-%m-%d %H:%M"))
+    log_queue = q.SimpleQueue()
+    listener = FlushingQueueListener(log_queue, file_handler)
+    logging.getLogger().addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    # Registered after logging's own exit hook, so it runs first and drains the queue before handlers close
+    atexit.register(listener.stop)
+
+
+setup_logging()
 
 
 class MainApp(ctk.CTk):
@@ -55,22 +304,17 @@ class MainApp(ctk.CTk):
         self.columnconfigure(2, weight=1)
 
         # Create Objects
-        self.title_frame = TitleFrame(self)
-        self.menu_frame = MenuFrame(self)
-        self.app_1_frame = App1Frame(self)
-        self.app_2_frame = App2Frame(self)
-        self.app_3_frame = App3Frame(self)
-        self.app_4_frame = App4Frame(self)
-        self.default_app_frame = DefaultAppFrame(self)
+        self.title_frame = self.build_frame(TitleFrame)
+        self.menu_frame = self.build_frame(MenuFrame)
+
+        # Applet frames are built the first time they are selected and kept until closed
+        self.app_frame_classes = [DefaultAppFrame, App1Frame, App2Frame, App3Frame, App4Frame]
+        self.app_frames = {}
 
         # Place Objects
         self.title_frame.grid(row=0, column=0, columnspan=3, pady=(0, PAD_Y*.5), sticky="ew")
         self.menu_frame.grid(row=1, column=0, padx=PAD_X, pady=PAD_Y, sticky="nsew")
-        self.app_1_frame.grid(row=1, column=1, columnspan=2, padx=(PAD_X, PAD_X*1.5), pady=PAD_Y, sticky="nsew")
-        self.app_2_frame.grid(row=1, column=1, columnspan=2, padx=(PAD_X, PAD_X*1.5), pady=PAD_Y, sticky="nsew")
-        self.app_3_frame.grid(row=1, column=1, columnspan=2, padx=(PAD_X, PAD_X*1.5), pady=PAD_Y, sticky="nsew")
-        self.app_4_frame.grid(row=1, column=1, columnspan=2, padx=(PAD_X, PAD_X*1.5), pady=PAD_Y, sticky="nsew")
-        self.default_app_frame.grid(row=1, column=1, columnspan=2, padx=(PAD_X, PAD_X*1.5), pady=PAD_Y, sticky="nsew")
+        self.show_app(0)
 
     def set_window_icon_based_on_os(self):
         """Sets the window icon based on the operating system."""
@@ -94,20 +338,45 @@ class MainApp(ctk.CTk):
             else:
                 print(f"Error: The icon file {icon_path} does not exist in the directory.")
 
-    def reload_apps(self):
-        # Generate Frames
-        self.app_1_frame = App1Frame(self)
-        self.app_2_frame = App2Frame(self)
-        self.app_3_frame = App3Frame(self)
-        self.app_4_frame = App4Frame(self)
-        self.default_app_frame = DefaultAppFrame(self)
-
-        # Place Frames
-        self.default_app_frame.grid(row=1, column=1, columnspan=2, padx=(PAD_X, PAD_X * 1.5), pady=PAD_Y, sticky="nsew")
-        self.app_1_frame.grid(row=1, column=1, columnspan=2, padx=(PAD_X, PAD_X * 1.5), pady=PAD_Y, sticky="nsew")
-        self.app_2_frame.grid(row=1, column=1, columnspan=2, padx=(PAD_X, PAD_X * 1.5), pady=PAD_Y, sticky="nsew")
-        self.app_3_frame.grid(row=1, column=1, columnspan=2, padx=(PAD_X, PAD_X * 1.5), pady=PAD_Y, sticky="nsew")
-        self.app_4_frame.grid(row=1, column=1, columnspan=2, padx=(PAD_X, PAD_X * 1.5), pady=PAD_Y, sticky="nsew")
+    def build_frame(self, frame_class):
+        with startup_profiler.measure(f"build {frame_class.__name__}"):
+            return frame_class(self)
+
+    def show_app(self, app_index):
+        """Raises the applet at `app_index`, building it on first use."""
+        frame = self.app_frames.get(app_index)
+        if frame is None:
+            frame_class = self.app_frame_classes[app_index]
+            # Start importing the applet's heavy dependencies before its widgets are built
+            for module in getattr(frame_class, "lazy_modules", ()):
+                module.preload()
+            frame = self.build_frame(frame_class)
+            frame.grid(row=1, column=1, columnspan=2, padx=(PAD_X, PAD_X * 1.5), pady=PAD_Y, sticky="nsew")
+            self.app_frames[app_index] = frame
+        if app_index == 0:
+            frame.refresh_metrics()
+        frame.tkraise()
+
+    def close_app(self, frame):
+        """Destroys a single applet so the next selection starts fresh; the other applets are untouched."""
+        for app_index, open_frame in list(self.app_frames.items()):
+            if open_frame is frame:
+                del self.app_frames[app_index]
+                frame.destroy()
+                logging.warning(f"Closed {type(frame).__name__}: {self.widget_count()} widgets, "
+                                f"{format_memory(memory_usage())} resident.")
+        self.show_app(0)
+
+    def widget_count(self):
+        """Number of live Tk widgets under the main window."""
+        count = 0
+        pending = [self]
+        while pending:
+            widget = pending.pop()
+            children = widget.winfo_children()
+            count += len(children)
+            pending.extend(children)
+        return count
 
     @staticmethod
     def generate_popup(title, description):
@@ -193,24 +462,8 @@ class MenuFrame(ctk.CTkFrame):
 
     # Handle button click for each app
     def handle_app(self, app_index):
-        frame_mapping = [
-            self.master.default_app_frame,
-            self.master.app_1_frame,
-            self.master.app_2_frame,
-            self.master.app_3_frame,
-            self.master.app_4_frame
-        ]
-
-        app_names = [
-            "Default App",
-            "Credential Tester",
-            "Command Runner",
-            "CIDR Calculator",
-            "Packet Capture"
-        ]
-
-        if 0 <= app_index <= len(frame_mapping):
-            frame_mapping[app_index].tkraise()
+        if 0 <= app_index < len(self.master.app_frame_classes):
+            self.master.show_app(app_index)
 
     def theme_switcher(self):
         """ Switch appearance mode and update switch text """
@@ -241,13 +494,22 @@ class DefaultAppFrame(ctk.CTkFrame):
         # Create Objects
         self.default_label = ctk.CTkLabel(self, text="Waiting for app selection...")
         self.revision_number = ctk.CTkLabel(self, text="Version 1.1", font=("Arial", 10, "italic"))
+        self.metrics = ctk.CTkLabel(self, text="", font=("Arial", 10, "italic"))
 
         # Place Objects
         self.default_label.grid(row=0, column=0, padx=PAD_X, pady=PAD_Y, sticky="nsew")
+        self.metrics.grid(row=1, column=0, columnspan=3)
         self.revision_number.grid(row=2, column=0, columnspan=3)
 
+    def refresh_metrics(self):
+        # Lets a long session confirm that opening/closing applets does not grow the process
+        self.metrics.configure(text=f"Widgets: {self.master.widget_count()}  |  "
+                                    f"Memory: {format_memory(memory_usage())}")
+
 
 class App1Frame(ctk.CTkFrame):
+    lazy_modules = (paramiko,)
+
     def __init__(self, master):
         super().__init__(master)
 
@@ -257,18 +519,21 @@ class App1Frame(ctk.CTkFrame):
         self.validate_button_color = "orange"
         self.validate_text_color = "black"
         self.current_image = 0
-        self.results = []
+        self.results = None
+        self.journal = None
+        self.engine = None
+        self.progress_id = None
         self.file_path = ""
         self.start_time = 0.0
-        self.queue = q.Queue()
+        self.queue = q.Queue(maxsize=SWEEP_QUEUE_SIZE)
 
         # Grid Config
-        self.rowconfigure(15, weight=1)
+        self.rowconfigure(17, weight=1)
         self.columnconfigure(1, weight=1)
 
         # Create Objects
         self.close_button = ctk.CTkButton(self, text="X", fg_color="red4", hover_color="firebrick3", width=10,
-                                          height=10, command=self.master.reload_apps)
+                                          height=10, command=lambda: self.master.close_app(self))
         self.label = ctk.CTkLabel(self, text="SSH Credential Check", font=("Roboto", 20))
         self.select_file = ctk.CTkButton(self, text="Import CSV", command=self.import_csv, width=50)
         self.program_description = ctk.CTkLabel(self,
@@ -278,10 +543,17 @@ class App1Frame(ctk.CTkFrame):
         self.dnac_ro_pwd = ctk.CTkEntry(self, placeholder_text="DNAC Password", width=175, show="*")
         self.local_pwd = ctk.CTkEntry(self, placeholder_text="Local Device Password", width=175,
                                       show="*", )
-        self.image_button = ctk.CTkButton(self, text="", image=images[self.current_image], compound="left",
+        self.concurrency = ctk.CTkEntry(self, placeholder_text=f"Concurrency ({DEFAULT_SWEEP_CONCURRENCY})",
+                                        width=175)
+        self.image_button = ctk.CTkButton(self, text="", image=get_images()[self.current_image], compound="left",
                                           fg_color="transparent", width=26, command=self.toggle_hide)
         self.submit_button = ctk.CTkButton(self, text="Check Fields", command=self.validate)
+        self.results_format = ctk.CTkOptionMenu(self, values=["CSV", "Parquet"], width=175)
+        self.resume = ctk.CTkCheckBox(self, text="Resume previous run")
+        self.fast_algorithms = ctk.CTkCheckBox(self, text="Prefer fast SSH algorithms")
         self.progress_bar = ctk.CTkProgressBar(self)
+        self.progress_label = ctk.CTkLabel(self, text="")
+        self.progress = None
 
         # Place Objects
         self.close_button.grid(row=0, column=1, padx=PAD_X, pady=PAD_Y, sticky="e")
@@ -292,8 +564,12 @@ class App1Frame(ctk.CTkFrame):
         self.tacacs_pwd.grid(row=6, column=1, padx=PAD_X, pady=PAD_Y)
         self.dnac_ro_pwd.grid(row=7, column=1, padx=PAD_X, pady=PAD_Y)
         self.local_pwd.grid(row=8, column=1, padx=PAD_X, pady=PAD_Y)
-        self.image_button.grid(row=9, column=1, padx=PAD_X, pady=PAD_Y)
-        self.submit_button.grid(row=10, column=1, padx=PAD_X, pady=PAD_Y)
+        self.concurrency.grid(row=9, column=1, padx=PAD_X, pady=PAD_Y)
+        self.image_button.grid(row=10, column=1, padx=PAD_X, pady=PAD_Y)
+        self.submit_button.grid(row=11, column=1, padx=PAD_X, pady=PAD_Y)
+        self.results_format.grid(row=12, column=1, padx=PAD_X, pady=PAD_Y)
+        self.resume.grid(row=13, column=1, padx=PAD_X, pady=PAD_Y)
+        self.fast_algorithms.grid(row=14, column=1, padx=PAD_X, pady=PAD_Y)
 
     def import_csv(self):
         # Open file dialog to select file
@@ -308,14 +584,14 @@ class App1Frame(ctk.CTkFrame):
                 return  # Exit the function if the file is not a CSV
 
             # If the file is CSV, proceed with further validation
-            accepted_columns = ["Device_Name", "IP_Address"]
             try:
-                # Read the CSV into a DataFrame
-                df = pd.read_csv(self.file_path)
+                # Only the header is read here, rows are validated as they are streamed into the sweep
+                with open(self.file_path, newline="", encoding="utf-8-sig") as csv_file:
+                    columns = read_csv_header(csv_file)
 
                 # Validate the columns in the CSV
-                for col in df.columns:
-                    if col not in accepted_columns:
+                for col in DEVICE_COLUMNS:
+                    if col not in columns:
                         self.program_description.configure(text=f"'Device_Name' or 'IP_Address' column not found.",
                                                            text_color="firebrick1")
                         self.master.generate_popup("Error", "CSV column names are incorrect.")
@@ -334,13 +610,13 @@ class App1Frame(ctk.CTkFrame):
     def toggle_hide(self):
         if self.current_image == 0:
             self.current_image = 1
-            self.image_button.configure(image=images[1])
+            self.image_button.configure(image=get_images()[1])
             self.tacacs_pwd.configure(show="")
             self.dnac_ro_pwd.configure(show="")
             self.local_pwd.configure(show="")
         else:
             self.current_image = 0
-            self.image_button.configure(image=images[0])
+            self.image_button.configure(image=get_images()[0])
             self.tacacs_pwd.configure(show="*")
             self.dnac_ro_pwd.configure(show="*")
             self.local_pwd.configure(show="*")
@@ -375,131 +651,852 @@ class App1Frame(ctk.CTkFrame):
             self.master.generate_popup("Validation Failed", "Fields are missing information or the CSV file is bad.")
 
     def execute(self):
-        threading.Thread(target=self.execute_task).start()
+        # Read the entries here on the main thread; Tk widgets must not be touched from the sweep threads
+        credentials = [
+            (self.tacacs_user.get(), self.tacacs_pwd.get(), "TACACS", "Success"),
+            ("dnac", self.dnac_ro_pwd.get(), "RO TACACS", "DNAC authentication Success"),
+            ("localuser", self.local_pwd.get(), "Local", "Local authentication Successful")
+        ]
+        try:
+            concurrency = int(self.concurrency.get() or DEFAULT_SWEEP_CONCURRENCY)
+        except ValueError:
+            self.concurrency.configure(border_color="red")
+            self.master.generate_popup("Validation Failed", "Concurrency must be a whole number.")
+            return
+        try:
+            self.results = ResultSink(self.file_path, self.results_format.get())
+        except (ImportError, OSError) as e:
+            self.master.generate_popup("Error", f"Unable to create the results file: {e}")
+            return
+        try:
+            # Opened after the results file, since a fresh journal truncates the one a resume would need
+            self.journal = SweepJournal(self.file_path, resume=bool(self.resume.get()))
+        except OSError as e:
+            self.results.discard()
+            self.master.generate_popup("Error", f"Unable to open the sweep journal: {e}")
+            return
+        self.submit_button.configure(state="disabled")
+        self.engine = SweepEngine(credentials, concurrency=concurrency, on_result=self.record_result,
+                                  fast_algorithms=bool(self.fast_algorithms.get()))
+        self.progress = ProgressChannel()
+        self.progress_bar.set(0)
+        self.progress_bar.grid(row=15, column=1, padx=PAD_X, pady=PAD_Y)
+        self.progress_label.grid(row=16, column=1, padx=PAD_X, pady=PAD_Y)
+        threading.Thread(target=self.execute_task, daemon=True).start()
+        self.progress_id = self.after(PROGRESS_INTERVAL_MS, self.execute_progress)
+
+    def destroy(self):
+        # Closing mid-sweep stops it: queued devices are dropped, the ones in flight finish and are recorded,
+        # and the journal stays open until then so a new sweep cannot truncate it underneath them
+        if self.progress_id is not None:
+            self.after_cancel(self.progress_id)
+        if self.engine is not None:
+            self.engine.stop()
+        super().destroy()
 
     def execute_task(self):
-        start_time = time.time()
         logging.warning(f'------------------------------ Start runtime Log ------------------------------')
-        print(self.tacacs_user.get())
-        print(self.tacacs_pwd.get())
-        time.sleep(1)
-        print(self.dnac_ro_pwd.get())
-        print(self.local_pwd.get())
-        self.load_devices_data()
-        self.assign_workers(8)
-        self.master.generate_popup("Success", f"Runtime: {round((time.time() - start_time), 2)} seconds.")
-        self.master.reload_apps()
+        # Parsing runs alongside the sweep, so the first SSH attempts start before the file is fully read
+        threading.Thread(target=self.load_devices_data, daemon=True).start()
+        try:
+            self.engine.run(self.queue)
+        finally:
+            known_hosts.save()
+            self.journal.close()
+            self.results.close()
+            self.progress.post_finished()
+
+    def record_result(self, device_dict):
+        self.journal.record(device_dict)
+        self.results.add(device_dict)
+        self.progress.post_completed()
 
     def execute_progress(self):
-        start_qsize = self.queue.qsize()
-        self.progress_bar.grid(row=14, column=1)
-        self.update()
-        while not self.queue.empty():
-            progress = start_qsize - self.queue.qsize()
-            self.master.after(0, self.update_progress_bar, progress)
-
-    def update_progress_bar(self, progress):
-        self.progress_bar.set(progress)
-        self.progress_bar.update()
+        """Drains the progress channel on a fixed timer; the only place the sweep touches the widgets."""
+        progress = self.progress.drain()
+        # A partial batch is otherwise only written when the next result arrives, which a slow device may delay
+        self.results.flush_if_due()
+        if progress.total:
+            self.progress_bar.set(progress.completed / progress.total)
+        self.progress_label.configure(text=progress.describe())
+        if progress.finished:
+            self.progress_id = None
+            self.master.generate_popup("Success", f"Runtime: {round(progress.elapsed(), 2)} seconds.\n"
+                                                  f"Resumed: {self.journal.skipped}  Results: {self.results.path}")
+            self.master.close_app(self)
+        else:
+            self.progress_id = self.after(PROGRESS_INTERVAL_MS, self.execute_progress)
 
     def load_devices_data(self):
-        df = pd.read_csv(self.file_path)
-        df.columns = [c.replace(' ', '_') for c in df.columns]
-        data_dict = df.to_dict(orient='records')
-        for device in data_dict:
-            self.queue.put(device)
+        try:
+            for device in inventory.iter_indexed(self.file_path):
+                if self.engine.stopped.is_set():
+                    break
+                self.progress.post_queued()
+                status = self.journal.status(device)
+                if status is not None:
+                    # Finished in an earlier run, carry the journaled outcome into this run's results
+                    self.results.add({**device, "Status": status})
+                    self.progress.post_completed()
+                    continue
+                self.queue.put(device)  # Blocks while the queue is full, so only a window of rows is in memory
+        except (OSError, ValueError, csv.Error, UnicodeDecodeError) as e:
+            logging.critical(f'Error reading {self.file_path}: {e}')
+        finally:
+            self.progress.post_loaded()
+            self.queue.put(SWEEP_DONE)
+
+
+def read_csv_header(csv_file):
+    """Reads the first row of an open CSV and normalizes it the same way for every loader."""
+    header = next(csv.reader(csv_file), [])
+    return [c.strip().replace(' ', '_') for c in header]
+
+
+def iter_devices_csv(file_path):
+    """Streams device rows from a CSV, validating each one as it is read.
+
+    Rows with a missing name or an IP that does not parse are still yielded so they show up in the
+    results, but carry an "Invalid" reason and are never connected to."""
+    with open(file_path, newline="", encoding="utf-8-sig") as csv_file:
+        columns = read_csv_header(csv_file)
+        reader = csv.DictReader(csv_file, fieldnames=columns)
+        for line_number, row in enumerate(reader, start=2):
+            device = parse_device(row, f"Line {line_number} of {file_path}")
+            if device is not None:
+                yield device
+
+
+def iter_devices(file_path):
+    """iter_devices_json for .json files, iter_devices_csv for anything else."""
+    if file_path.lower().endswith(".json"):
+        return iter_devices_json(file_path)
+    return iter_devices_csv(file_path)
+
+
+def iter_devices_json(file_path):
+    """Same as iter_devices_csv for a JSON list of device objects."""
+    with open(file_path, encoding="utf-8-sig") as json_file:
+        rows = json.load(json_file)
+    if not isinstance(rows, list):
+        raise ValueError(f"{file_path} must contain a list of devices")
+    for index, row in enumerate(rows):
+        device = parse_device(row, f"Entry {index} of {file_path}")
+        if device is not None:
+            yield device
+
+
+def parse_device(row, location):
+    """Builds a device dict from one loaded row, or None for a blank row.
+
+    Site and Role are optional columns; rows that cannot be connected to carry an "Invalid" reason."""
+    device = {
+        "Device_Name": str(row.get("Device_Name") or "").strip(),
+        "IP_Address": str(row.get("IP_Address") or "").strip()
+    }
+    if not device["Device_Name"] and not device["IP_Address"]:
+        return None
+    for column in ("Site", "Role"):
+        if row.get(column):
+            device[column] = str(row[column]).strip()
+    try:
+        ipaddress.ip_address(device["IP_Address"])
+        if not device["Device_Name"]:
+            device["Invalid"] = "Missing Device_Name"
+    except ValueError:
+        device["Invalid"] = "Invalid IP_Address"
+    if "Invalid" in device:
+        logging.critical(f'{location}: {device["Invalid"]}.')
+    return device
+
+
+class Inventory:
+    """Devices the apps have read this session, indexed by IP, site and role and shared by every frame.
+
+    The sweep and bulk collection stream their files through iter_indexed(), so a file they read is
+    indexed as it goes and is not parsed again when App2 loads or imports it. Only the name, IP, site
+    and role of each device are kept, so the index grows by one small dict per device rather than by
+    the rows the sweep has in flight. Site names are kept sorted so type-ahead filtering is a bisect
+    rather than a scan. Devices without a Site use their name as the site, and devices without a Role
+    are listed as "Device"."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.by_ip = {}
+        self.by_site = {}  # site -> {role: device}
+        self.by_role = {}  # role -> [device]
+        self.files = {}  # (absolute path, modification time) -> IPs of the valid devices in a fully read file
+        self.sorted_sites = None  # Lowercased site names, rebuilt on the next search after devices are added
+        self.site_names = []
+        self.default_loaded = False
+
+    def __len__(self):
+        return len(self.by_ip)
+
+    def add(self, device):
+        """Indexes a copy of a valid device; an IP that is already known keeps its first entry."""
+        with self.lock:
+            if device["IP_Address"] in self.by_ip:
+                return
+            device = {
+                "Device_Name": device["Device_Name"],
+                "IP_Address": device["IP_Address"],
+                "Site": device.get("Site") or device["Device_Name"],
+                "Role": device.get("Role") or "Device"
+            }
+            roles = self.by_site.setdefault(device["Site"], {})
+            role = device["Role"] if device["Role"] not in roles else f'{device["Role"]} {device["IP_Address"]}'
+            roles[role] = device
+            self.by_role.setdefault(device["Role"], []).append(device)
+            self.by_ip[device["IP_Address"]] = device
+            self.sorted_sites = None
+
+    @staticmethod
+    def file_key(file_path):
+        return os.path.abspath(file_path), os.path.getmtime(file_path)
+
+    def iter_indexed(self, file_path):
+        """iter_devices(file_path), indexing each valid device as it is yielded.
+
+        The file is only remembered as indexed once it has been read to the end, so a sweep that is
+        stopped part way through leaves it to be read in full by the next load()."""
+        key = self.file_key(file_path)
+        ips = []
+        for device in iter_devices(file_path):
+            if "Invalid" not in device:
+                self.add(device)
+                ips.append(device["IP_Address"])
+            yield device
+        with self.lock:
+            self.files[key] = ips
+
+    def load(self, file_path):
+        """Indexes the valid devices in a CSV or JSON file and returns their IPs.
+
+        A file that was already read this session, and has not changed since, is not parsed again."""
+        with self.lock:
+            ips = self.files.get(self.file_key(file_path))
+        if ips is None:
+            ips = [device["IP_Address"] for device in self.iter_indexed(file_path) if "Invalid" not in device]
+        return ips
+
+    def device(self, ip):
+        with self.lock:
+            return self.by_ip.get(ip)
+
+    def load_default(self):
+        """Loads INVENTORY_FILES, or the sample sites if there are none. Slow for big files; call off the Tk thread."""
+        if self.default_loaded:
+            return len(self)
+        self.default_loaded = True
+        for file_path in INVENTORY_FILES:
+            if os.path.exists(file_path):
+                try:
+                    self.load(file_path)
+                except (OSError, ValueError, csv.Error, UnicodeDecodeError) as e:
+                    logging.critical(f"Unable to load inventory {file_path}: {e}")
+        if not self.by_ip:
+            for device in SAMPLE_INVENTORY:
+                self.add(dict(device))
+        return len(self)
+
+    def search_sites(self, prefix, limit=SITE_MENU_LIMIT):
+        """Sites starting with `prefix` (case-insensitive), in sorted order."""
+        with self.lock:
+            if self.sorted_sites is None:
+                self.site_names = sorted(self.by_site, key=str.lower)
+                self.sorted_sites = [site.lower() for site in self.site_names]
+            prefix = prefix.lower()
+            start = bisect.bisect_left(self.sorted_sites, prefix)
+            end = bisect.bisect_left(self.sorted_sites, prefix + "\uffff", lo=start)
+            return self.site_names[start:min(end, start + limit)]
+
+    def roles(self, site):
+        with self.lock:
+            return list(self.by_site.get(site, {}))
+
+    def lookup(self, site, role):
+        """IP of the device with `role` at `site`, or None."""
+        with self.lock:
+            device = self.by_site.get(site, {}).get(role)
+        return device["IP_Address"] if device else None
+
+    def role_names(self):
+        with self.lock:
+            return sorted(self.by_role, key=str.lower)
+
+    def devices_at(self, sites, role=None, limit=TARGET_LIST_LIMIT):
+        """Devices at `sites`, only those with `role` when it is given."""
+        with self.lock:
+            if role is None:
+                devices = [device for site in sites for device in self.by_site.get(site, {}).values()]
+            else:
+                sites = set(sites)
+                devices = [device for device in self.by_role.get(role, []) if device["Site"] in sites]
+        return devices[:limit]
+
+
+inventory = Inventory()
+
+
+class ProgressChannel:
+    """Carries sweep progress from the loader and sweep threads to the Tk main loop.
 
-    def worker(self):
+    Threads only post events to a SimpleQueue; `drain()` is called from one `after()` timer and folds
+    everything posted since the last tick into the counters, so UI cost does not depend on sweep size."""
+    QUEUED, LOADED, COMPLETED, FINISHED = range(4)
+
+    def __init__(self):
+        self.events = q.SimpleQueue()
+        self.start_time = time.perf_counter()
+        self.total = 0
+        self.completed = 0
+        self.loaded = False
+        self.finished = False
+
+    def post_queued(self):
+        self.events.put(self.QUEUED)
+
+    def post_loaded(self):
+        self.events.put(self.LOADED)
+
+    def post_completed(self):
+        self.events.put(self.COMPLETED)
+
+    def post_finished(self):
+        self.events.put(self.FINISHED)
+
+    def drain(self):
         while True:
             try:
-                host = self.queue.get(timeout=1)  # Add timeout to avoid indefinite blocking
-                self.connect(host)
-                self.queue.task_done()  # Mark task done
+                event = self.events.get_nowait()
             except q.Empty:
-                break
-
-    def assign_workers(self, threads):
-        threads_list = []
-        thread_event = threading.Event()  # Event to signal completion of workers
+                return self
+            if event == self.QUEUED:
+                self.total += 1
+            elif event == self.COMPLETED:
+                self.completed += 1
+            elif event == self.LOADED:
+                self.loaded = True
+            else:
+                self.finished = True
 
-        def worker_thread():
-            self.worker()
-            thread_event.set()  # Signal that worker is done
+    def elapsed(self):
+        return time.perf_counter() - self.start_time
 
-        for t in range(threads):
-            thread = threading.Thread(target=worker_thread)
-            threads_list.append(thread)
-            thread.start()
+    def describe(self):
+        rate = self.completed / max(self.elapsed(), 1e-6)
+        if not self.loaded:
+            eta = "counting devices..."
+        elif rate:
+            eta = time.strftime("%H:%M:%S", time.gmtime((self.total - self.completed) / rate))
+        else:
+            eta = "--:--:--"
+        return f"{self.completed}/{self.total} devices  |  {rate:.1f} devices/s  |  ETA {eta}"
+
+
+class ResultSink:
+    """Buffers sweep outcomes column by column and appends them to disk in batches while the sweep runs.
+
+    Only the current batch is held in memory, so run size does not matter, and every batch written
+    survives a crash. CSV batches are appended to one file; Parquet batches are written as numbered
+    part files in a directory because a Parquet file is unreadable until its footer is written."""
+    COLUMNS = ["Device_Name", "IP_Address", "Status"]
+
+    def __init__(self, source_path, file_format="CSV", batch_size=RESULT_BATCH_SIZE,
+                 flush_interval=RESULT_FLUSH_INTERVAL):
+        self.file_format = file_format
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.columns = {column: [] for column in self.COLUMNS}
+        self.written = 0
+        self.parts = 0
+        self.last_flush = time.monotonic()
+
+        os.makedirs("Results", exist_ok=True)
+        name = os.path.splitext(os.path.basename(source_path))[0]
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        if file_format == "Parquet":
+            pyarrow_parquet.load()  # Fail now, not mid-sweep, if pyarrow is missing
+            self.path = os.path.join("Results", f"{name}_results_{stamp}")
+            os.makedirs(self.path)
+        else:
+            self.path = os.path.join("Results", f"{name}_results_{stamp}.csv")
+            with open(self.path, "w", newline="") as results_file:
+                csv.writer(results_file).writerow(self.COLUMNS)
+
+    def add(self, device_dict):
+        with self.lock:
+            for column, values in self.columns.items():
+                values.append(device_dict[column])
+            if (len(self.columns["Status"]) >= self.batch_size
+                    or time.monotonic() - self.last_flush >= self.flush_interval):
+                self.flush()
+
+    def flush_if_due(self):
+        """Writes the buffered batch once it is `flush_interval` old, for when results stop arriving."""
+        with self.lock:
+            if time.monotonic() - self.last_flush >= self.flush_interval:
+                self.flush()
+
+    def flush(self):
+        """Writes the buffered batch. Callers hold `self.lock`."""
+        rows = len(self.columns["Status"])
+        if rows:
+            if self.file_format == "Parquet":
+                part_path = os.path.join(self.path, f"part-{self.parts:05d}.parquet")
+                pyarrow_parquet.write_table(pyarrow.table(self.columns), part_path)
+                self.parts += 1
+            else:
+                with open(self.path, "a", newline="") as results_file:
+                    csv.writer(results_file).writerows(zip(*self.columns.values()))
+                    results_file.flush()
+                    os.fsync(results_file.fileno())
+            self.written += rows
+            self.columns = {column: [] for column in self.COLUMNS}
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        with self.lock:
+            self.flush()
+        logging.warning(f'Wrote {self.written} results to {self.path}.')
+
+    def discard(self):
+        """Deletes the results file or directory of a sweep that never started."""
+        try:
+            if self.file_format == "Parquet":
+                shutil.rmtree(self.path)
+            else:
+                os.remove(self.path)
+        except OSError as e:
+            logging.warning(f"Unable to remove {self.path}: {e}")
+
+
+class SweepJournal:
+    """Append-only record of the devices a sweep has finished, kept per input CSV.
+
+    Every result is written as one line as soon as it completes. A sweep started with `resume=True`
+    reads the journal back and skips devices already in it; otherwise the journal starts empty.
+    A journal still open in a stopping sweep cannot be opened again until that sweep closes it."""
+    open_paths = set()  # Journals held by a running or stopping sweep
+    open_paths_lock = threading.Lock()
+
+    def __init__(self, source_path, resume=False, sync_interval=RESULT_FLUSH_INTERVAL):
+        name = os.path.splitext(os.path.basename(source_path))[0]
+        source_key = hashlib.sha1(os.path.abspath(source_path).encode()).hexdigest()[:8]
+        os.makedirs("Results", exist_ok=True)
+        self.path = os.path.join("Results", f"{name}-{source_key}.journal")
+        self.sync_interval = sync_interval
+        self.lock = threading.Lock()
+        with self.open_paths_lock:
+            if self.path in self.open_paths:
+                raise OSError(f"{self.path} is still in use by a sweep that is finishing")
+            self.open_paths.add(self.path)
+        try:
+            self.completed = self.read() if resume else {}
+            self.skipped = 0
+            if resume:
+                self.drop_torn_line()
+            self.file = open(self.path, "a" if resume else "w", newline="")
+        except Exception:
+            self.release()
+            raise
+        self.writer = csv.writer(self.file, lineterminator="\n")
+        self.last_sync = time.monotonic()
+
+    def read(self):
+        completed = {}
+        if os.path.exists(self.path):
+            with open(self.path, newline="") as journal_file:
+                for line in journal_file:
+                    if not line.endswith("\n"):
+                        continue  # Torn final line from an interrupted write
+                    row = next(csv.reader([line]), [])
+                    if len(row) == 3:
+                        completed[(row[0], row[1])] = row[2]
+        logging.warning(f'Resuming from {self.path}: {len(completed)} devices already finished.')
+        return completed
+
+    def drop_torn_line(self):
+        """Truncates a line torn by a crash back to the last newline, so the journal only holds whole entries."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r+b") as journal_file:
+            end = journal_file.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(0, position - JOURNAL_SCAN_BYTES)
+                journal_file.seek(start)
+                newline = journal_file.read(position - start).rfind(b"\n")
+                if newline != -1:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position < end:
+                journal_file.truncate(position)
+
+    def status(self, device):
+        """The journaled status for a device finished in an earlier run, or None."""
+        status = self.completed.get((device["Device_Name"], device["IP_Address"]))
+        if status is not None:
+            self.skipped += 1
+        return status
+
+    def record(self, device_dict):
+        with self.lock:
+            self.writer.writerow([device_dict["Device_Name"], device_dict["IP_Address"], device_dict["Status"]])
+            self.file.flush()
+            if time.monotonic() - self.last_sync >= self.sync_interval:
+                os.fsync(self.file.fileno())
+                self.last_sync = time.monotonic()
+
+    def release(self):
+        with self.open_paths_lock:
+            self.open_paths.discard(self.path)
+
+    def close(self):
+        try:
+            with self.lock:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+                self.file.close()
+        finally:
+            self.release()
+
+
+class KnownHostsStore:
+    """Host keys seen so far, shared by every sweep and App2Frame thread.
+
+    The file is parsed once, line by line, and indexed by host, so a lookup is a dict access instead of
+    a scan. Unknown hosts are trusted on first use and appended to the file on save(). A known host
+    presenting a different key, or a key of a type not stored for it, raises BadHostKeyException."""
+
+    def __init__(self, path=None):
+        self.path = path  # None keeps the store in memory only
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.index = {}  # host -> {key type: key}
+        self.pending = []  # New known_hosts lines not yet written
+
+    def load(self):
+        # Called with the lock held; deferred so paramiko is only imported once a connection is made
+        self.loaded = True
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as file:
+                for line_number, line in enumerate(file, 1):
+                    line = line.strip()
+                    if not line or line.startswith("#"):
+                        continue
+                    entry = paramiko.hostkeys.HostKeyEntry.from_line(line, line_number)
+                    if entry is None:
+                        continue
+                    for hostname in entry.hostnames:
+                        self.index.setdefault(hostname, {})[entry.key.get_name()] = entry.key
+        except (OSError, paramiko.SSHException, paramiko.hostkeys.InvalidHostKey) as e:
+            logging.critical(f"Unable to read {self.path}, keeping the {len(self.index)} hosts read so far: {e}")
+
+    def verify(self, host, key, port=SSH_PORT):
+        """Checks `key` against the stored keys for `host`, learning it if the host is new."""
+        self.verify_hostname(host if port == SSH_PORT else f"[{host}]:{port}", key)
+
+    def verify_hostname(self, hostname, key):
+        """verify() for a hostname already in known_hosts form ("host" or "[host]:port")."""
+        with self.lock:
+            if not self.loaded:
+                self.load()
+            known = self.index.setdefault(hostname, {})
+            stored = known.get(key.get_name())
+            if stored is None and known:
+                # A known host offering a key type it never used before is as suspect as a changed key
+                stored = next(iter(known.values()))
+                logging.critical(f"{hostname} presented a {key.get_name()} host key but only "
+                                 f"{', '.join(known)} is known for it.")
+                raise paramiko.BadHostKeyException(hostname, key, stored)
+            if stored is None:
+                known[key.get_name()] = key
+                self.pending.append(f"{hostname} {key.get_name()} {key.get_base64()}\n")
+                logging.warning(f"Learned {key.get_name()} host key for {hostname}.")
+            elif stored != key:
+                raise paramiko.BadHostKeyException(hostname, key, stored)
+
+    def missing_host_key(self, client, hostname, key):
+        """paramiko MissingHostKeyPolicy hook, so SSHClient checks the key before it authenticates."""
+        self.verify_hostname(hostname, key)
+
+    def save(self):
+        with self.lock:
+            lines, self.pending = self.pending, []
+        if self.path and lines:
+            try:
+                with open(self.path, "a") as file:
+                    file.writelines(lines)
+            except OSError as e:
+                logging.critical(f"Unable to save host keys to {self.path}: {e}")
+
+
+known_hosts = KnownHostsStore(KNOWN_HOSTS_FILE)
+atexit.register(known_hosts.save)
+
+
+def prefer_fast_algorithms(options):
+    """Moves FAST_KEX and FAST_CIPHERS to the front of a transport's offer, keeping everything else after."""
+    for attribute, preferred in (("kex", FAST_KEX), ("ciphers", FAST_CIPHERS)):
+        offered = getattr(options, attribute)
+        first = tuple(name for name in preferred if name in offered)
+        setattr(options, attribute, first + tuple(name for name in offered if name not in first))
+
+
+# Credential sweep engine used by App1Frame
+class SweepEngine:
+    """Checks queued devices against the credential chain with configurable concurrency.
+
+    Every device is scheduled as an asyncio task. A non-blocking TCP probe to the SSH port runs first,
+    so hosts that are down are recorded without ever reaching paramiko. Live hosts have their blocking
+    paramiko work handed to a thread pool of `concurrency` workers, so the thread count is fixed no
+    matter how large the CSV is. `on_result` runs in order on one writer thread, so its file writes
+    and fsyncs never stall the event loop.
+    """
+
+    def __init__(self, credentials, concurrency=DEFAULT_SWEEP_CONCURRENCY, timeout=SSH_TIMEOUT, on_result=None,
+                 probe_concurrency=DEFAULT_PROBE_CONCURRENCY, probe_timeout=PROBE_TIMEOUT, host_keys=None,
+                 fast_algorithms=False):
+        # credentials: ordered list of (username, password, label, success_status) tried for each device
+        self.credentials = credentials
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.on_result = on_result
+        self.probe_concurrency = max(self.concurrency, probe_concurrency)
+        self.probe_timeout = probe_timeout
+        self.host_keys = known_hosts if host_keys is None else host_keys
+        self.fast_algorithms = fast_algorithms
+        self.checked = 0
+        self.unreachable = 0
+        self.phase_times = {}  # phase -> (total seconds, samples)
+        self.timing_lock = threading.Lock()
+        self.stopped = threading.Event()
+
+    def run(self, queue):
+        """Drains `queue` until SWEEP_DONE is reached and returns the number of devices checked."""
+        return asyncio.run(self.sweep(queue))
+
+    def stop(self):
+        """Stops starting logins, letting those in progress finish. The queue is still drained to SWEEP_DONE
+        so its producer never blocks."""
+        self.stopped.set()
+
+    async def sweep(self, queue):
+        loop = asyncio.get_running_loop()
+        in_flight = asyncio.Semaphore(self.probe_concurrency)
+        auth_slots = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="sweep") as executor, \
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix="sweep-results") as writer:
+            while True:
+                try:
+                    host = queue.get_nowait()
+                except q.Empty:
+                    # Producer is still filling the queue, wait for it without blocking the event loop
+                    host = await loop.run_in_executor(None, queue.get)
+                if host is SWEEP_DONE:
+                    break
+                if self.stopped.is_set():
+                    continue
+                await in_flight.acquire()
+                task = asyncio.create_task(self.check(loop, executor, writer, in_flight, auth_slots, host))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*list(tasks))
+        logging.warning(f'Sweep checked {self.checked} devices, {self.unreachable} unreachable on probe.')
+        return self.checked
+
+    async def probe(self, host):
+        """Opens and closes a TCP connection to the SSH port. Returns None if the host is up, else a failure status."""
+        start = time.perf_counter()
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(host["IP_Address"], host.get("Port", SSH_PORT)), self.probe_timeout)
+        except asyncio.TimeoutError:
+            logging.critical(f'Connection to {host["IP_Address"]} timed out.',
+                             extra=log_context(host["IP_Address"], "probe", time.perf_counter() - start))
+            return "Connection Timeout"
+        except OSError:
+            logging.critical(f'Connection to {host["IP_Address"]} was unsuccessful.',
+                             extra=log_context(host["IP_Address"], "probe", time.perf_counter() - start))
+            return "Connection Failure"
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return None
 
-        for thread in threads_list:
-            thread.join()  # Wait for all threads to complete
-            thread_event.clear()  # Reset the event
+    async def check(self, loop, executor, writer, in_flight, auth_slots, host):
+        try:
+            if "Invalid" in host:
+                status = f'Invalid Entry: {host["Invalid"]}'
+            else:
+                status = await self.probe(host)
+                self.unreachable += bool(status)
+            if status:
+                device_dict = {"Device_Name": host["Device_Name"], "IP_Address": host["IP_Address"],
+                               "Status": status}
+            else:
+                async with auth_slots:
+                    if self.stopped.is_set():
+                        return  # Left out of the results and journal, so a resumed sweep checks it
+                    device_dict = await loop.run_in_executor(executor, self.connect, host)
+        except Exception as e:
+            logging.critical(f'Unexpected error checking {host["IP_Address"]}: {e}',
+                             extra=log_context(host["IP_Address"], "check"))
+            device_dict = {"Device_Name": host["Device_Name"], "IP_Address": host["IP_Address"],
+                           "Status": f"Error: {e}"}
+        finally:
+            in_flight.release()
+        self.checked += 1
+        if self.on_result:
+            await loop.run_in_executor(writer, self.on_result, device_dict)
+
+    def open_transport(self, host, timings):
+        """Opens the TCP connection and runs key exchange once, recording both phases in `timings`."""
+        phase_start = time.perf_counter()
+        sock = socket.create_connection((host["IP_Address"], host.get("Port", SSH_PORT)), timeout=self.timeout)
+        timings["connect"] = timings.get("connect", 0.0) + time.perf_counter() - phase_start
+        phase_start = time.perf_counter()
+        transport = paramiko.Transport(sock)
+        transport.banner_timeout = self.timeout
+        transport.auth_timeout = self.timeout
+        if self.fast_algorithms:
+            prefer_fast_algorithms(transport.get_security_options())
+        try:
+            transport.start_client(timeout=self.timeout)
+            self.host_keys.verify(host["IP_Address"], transport.get_remote_server_key(),
+                                  host.get("Port", SSH_PORT))
+        except Exception:
+            transport.close()
+            raise
+        timings["kex"] = timings.get("kex", 0.0) + time.perf_counter() - phase_start
+        return transport
+
+    def record_timings(self, host, timings):
+        with self.timing_lock:
+            for phase, elapsed in timings.items():
+                total, count = self.phase_times.get(phase, (0.0, 0))
+                self.phase_times[phase] = (total + elapsed, count + 1)
+        breakdown = " ".join(f"{phase}={elapsed * 1000:.0f}ms" for phase, elapsed in timings.items())
+        logging.warning(f'Timing for {host["IP_Address"]}: {breakdown}',
+                        extra=log_context(host["IP_Address"], "total", sum(timings.values())))
 
     # SSH Function
     def connect(self, host):
-        ssh = paramiko.SSHClient()
-        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        """Tries each credential as an auth_password call on one transport, so key exchange happens once per host.
+
+        Devices that drop the session after a failed login get a fresh transport for the remaining credentials.
+        A failed credential is never sent twice, so a sweep cannot add to account lockout counters. The one
+        exception: a device may hang up when the username changes on a connection (RFC 4252 allows it)
+        without judging the password, so a credential that changed the username and lost the connection
+        is sent once more on a new transport."""
         device_dict = {
             "Device_Name": host["Device_Name"],
             "IP_Address": host["IP_Address"],
             "Status": ""
         }
+        timings = {}
+        transport = None
         try:
-            print(f'Attempting SSH to {host["IP_Address"]} using TACACS.')
-            logging.warning(f'Attempting SSH to {host["IP_Address"]} using TACACS.')
-            ssh.connect(hostname=host["IP_Address"], username=self.tacacs_user.get(), password=self.tacacs_pwd.get(),
-                        timeout=3)
-            device_dict["Status"] = "Success"
-            print(f'TACACS Authentication to {host["IP_Address"]} was successful.')
-            logging.warning(f'TACACS Authentication to {host["IP_Address"]} was successful.')
-        except paramiko.ssh_exception.NoValidConnectionsError:
-            device_dict["Status"] = "Connection Failure"
-            print(f'Connection to {host["IP_Address"]} was unsuccessful.')
-            logging.critical(f'Connection to {host["IP_Address"]} was unsuccessful.')
-        except (paramiko.SSHException, paramiko.AuthenticationException, paramiko.BadAuthenticationType):
-            try:
-                print(f'User TACACS Failed. Attempting SSH to {host["IP_Address"]} using RO TACACS.')
-                logging.critical(f'User TACACS Failed. Attempting SSH to {host["IP_Address"]} using RO TACACS.')
-                ssh.connect(hostname=host["IP_Address"], username="dnac", password=self.dnac_ro_pwd.get(),
-                            timeout=3)
-                device_dict["Status"] = "DNAC authentication Success"
-                logging.warning(f'DNAC authentication to {host["IP_Address"]} was successful.')
-            except (paramiko.SSHException, paramiko.AuthenticationException, paramiko.BadAuthenticationType):
+            transport = self.open_transport(host, timings)
+            sent_username = None  # Username last tried on `transport`
+            for username, password, label, success_status in self.credentials:
+                phase = f"auth {label}"
+                phase_start = time.perf_counter()
                 try:
-                    print(f'User and RO TACACS Failed. Attempting SSH to {host["IP_Address"]} using Local.')
-                    logging.critical(f'User and RO TACACS Failed. Attempting SSH to {host["IP_Address"]} using Local.')
-                    ssh.connect(hostname=host["IP_Address"], username="localuser", password=self.local_pwd.get(), timeout=3)
-                    print(f'Local authentication to {host["IP_Address"]} was successful.')
-                    logging.warning(f'Local authentication to {host["IP_Address"]} was successful.')
-                    device_dict["Status"] = "Local authentication Successful"
+                    for retry in (False, True):
+                        if not transport.is_active():
+                            transport.close()
+                            transport = self.open_transport(host, timings)
+                            sent_username = None
+                        changed_username = sent_username not in (None, username)
+                        sent_username = username
+                        try:
+                            transport.auth_password(username, password)
+                            break
+                        except paramiko.SSHException:
+                            # Covers AuthenticationException, including paramiko's "transport shut down or
+                            # saw EOF" from a device that rejects a login and hangs up; that is a rejection
+                            if retry or not changed_username or transport.is_active():
+                                raise
+                            logging.warning(f'{host["IP_Address"]} closed the session, retrying {label} on a new '
+                                            f'connection.', extra=log_context(host["IP_Address"], phase))
+                    device_dict["Status"] = success_status
+                    logging.warning(f'{label} authentication to {host["IP_Address"]} was successful.',
+                                    extra=log_context(host["IP_Address"], phase, time.perf_counter() - phase_start))
+                    break
                 except (paramiko.SSHException, paramiko.AuthenticationException, paramiko.BadAuthenticationType):
-                    print(f'Local Authentication to {host["IP_Address"]} was unsuccessful.')
-                    logging.critical(f'Local Authentication to {host["IP_Address"]} was unsuccessful.')
-                    device_dict["Status"] = "TACACS/Local authentication Failure"
+                    logging.critical(f'{label} authentication to {host["IP_Address"]} was unsuccessful.',
+                                     extra=log_context(host["IP_Address"], phase, time.perf_counter() - phase_start))
+                finally:
+                    timings[phase] = time.perf_counter() - phase_start
+            else:
+                device_dict["Status"] = "TACACS/Local authentication Failure"
         except socket.timeout:
             device_dict["Status"] = "Connection Timeout"
-            print(f'Connection to {host["IP_Address"]} timed out.')
-            logging.critical(f'Connection to {host["IP_Address"]} timed out.')
-        self.results.append(device_dict)
-        ssh.close()
+            logging.critical(f'Connection to {host["IP_Address"]} timed out.',
+                             extra=log_context(host["IP_Address"], "connect"))
+        except OSError:
+            device_dict["Status"] = "Connection Failure"
+            logging.critical(f'Connection to {host["IP_Address"]} was unsuccessful.',
+                             extra=log_context(host["IP_Address"], "connect"))
+        except paramiko.BadHostKeyException as e:
+            device_dict["Status"] = "Host Key Mismatch"
+            logging.critical(f'Host key for {host["IP_Address"]} does not match {KNOWN_HOSTS_FILE}: {e}',
+                             extra=log_context(host["IP_Address"], "kex"))
+        except paramiko.SSHException as e:
+            device_dict["Status"] = "SSH Negotiation Failure"
+            logging.critical(f'SSH negotiation with {host["IP_Address"]} failed: {e}',
+                             extra=log_context(host["IP_Address"], "kex"))
+        finally:
+            if transport:
+                transport.close()
+        self.record_timings(host, timings)
+        return device_dict
+
+    def timing_summary(self):
+        """Average seconds spent in each phase across all checked hosts."""
+        with self.timing_lock:
+            return {phase: total / count for phase, (total, count) in self.phase_times.items()}
 
 
 class App2Frame(ctk.CTkFrame):
+    lazy_modules = (netmiko, paramiko)
+
     def __init__(self, master):
         super().__init__(master)
 
         # App Configuration/Variables
-        self.device_dict = {
-            "Site1": ["10.1.100.11", "10.1.200.11"],
-            "Site2": ["10.2.100.11", "10.2.200.11"],
-            "Site3": ["10.3.100.11", "10.3.200.11"],
-            "Site4": ["10.4.100.11", "10.4.200.11"]
-        }
-        self.ssh_client = None
+        self.filter_id = None
+        self.inventory_poll_id = None
+        self.session_pool = SessionPool()
+        self.command_cache = CommandCache()
+        self.connection = ConnectionLifecycle(self.session_pool)  # Session the Connect button opened
         self.default_button_fg_color = ('#3B8ED0', '#1F6AA5')
         self.default_button_hover_color = ('#36719F', '#144870')
         self.default_button_text_color = ('#DCE4EE', '#DCE4EE')
-        self.connection_thread = None
+        default_style = {"text_color": self.default_button_text_color, "fg_color": self.default_button_fg_color,
+                         "hover_color": self.default_button_hover_color}
+        busy_style = {"text_color": "black", "fg_color": "gold2", "hover_color": "gold3"}
+        self.connect_button_styles = {
+            ConnectionLifecycle.IDLE: {"text": "Connect", **default_style},
+            ConnectionLifecycle.CONNECTING: {"text": "Establishing...", **busy_style},
+            ConnectionLifecycle.CONNECTED: {"text": "Disconnect", **default_style, "fg_color": "firebrick3",
+                                            "hover_color": "firebrick4"},
+            ConnectionLifecycle.DISCONNECTING: {"text": "Disconnecting...", **busy_style},
+            ConnectionLifecycle.FAILED: {"text": "Retry Connect", **default_style, "fg_color": "gray40",
+                                         "hover_color": "gray30"},
+        }
+        self.targets = []  # (name, ip) pairs used when fan-out mode is on
 
         # Grid Config
         self.rowconfigure([14], weight=1)
@@ -507,7 +1504,7 @@ class App2Frame(ctk.CTkFrame):
 
         # Create Objects
         self.close_button = ctk.CTkButton(self, text="X", fg_color="red4", hover_color="firebrick3", width=10,
-                                          height=10, command=self.master.reload_apps)
+                                          height=10, command=lambda: self.master.close_app(self))
         self.description = ctk.CTkLabel(self,
                                         text="Select a Site & Device - OR - enter a specific IP;\n "
                                              "specific IP takes priority.\n"
@@ -515,10 +1512,22 @@ class App2Frame(ctk.CTkFrame):
         self.credential_label = ctk.CTkLabel(self, text="Credentials")
         self.username = ctk.CTkEntry(self, placeholder_text="Username")
         self.password = ctk.CTkEntry(self, placeholder_text="Password", show="*")
-        self.site_selection = ctk.CTkOptionMenu(self,
-                                                values=["None", "Site1", "Site2", "Site3", "Site4"])
-        self.device_selection = ctk.CTkOptionMenu(self, values=["None", "Core", "WLC"])
+        self.site_selection = ctk.CTkOptionMenu(self, values=["None"],
+                                                command=self.select_site)
+        self.device_selection = ctk.CTkOptionMenu(self, values=["None"])
+        self.site_filter = ctk.CTkEntry(self, placeholder_text="Filter sites")
+        self.site_filter.bind("<KeyRelease>", self.schedule_site_filter)
+        self.inventory_button = ctk.CTkButton(self, text="Load Inventory", command=self.load_inventory)
+        self.inventory_label = ctk.CTkLabel(self, text="")
         self.ip_address = ctk.CTkEntry(self, placeholder_text="Switch IP")
+        self.fan_out = ctk.CTkSwitch(self, text="Run on multiple devices")
+        self.targets_button = ctk.CTkButton(self, text="Select Targets", command=self.select_targets)
+        self.targets_label = ctk.CTkLabel(self, text="0 targets")
+        self.stream_output = ctk.CTkSwitch(self, text="Stream raw output")
+        self.force_refresh = ctk.CTkCheckBox(self, text="Force refresh")
+        self.queue_label = ctk.CTkLabel(self, text="Queue: 0")
+        self.cancel_button = ctk.CTkButton(self, text="Cancel Queued", command=self.session_pool.cancel_pending)
+        self.bulk_button = ctk.CTkButton(self, text="Bulk Collect", command=lambda: BulkCollectWindow(self))
         self.connect_button = ctk.CTkButton(self, text="Connect", command=self.ssh_connection)
         self.command_1 = ctk.CTkButton(self, text="Get Info",
                                        command=lambda: self.cli_command("sh version"))
@@ -533,8 +1542,8 @@ class App2Frame(ctk.CTkFrame):
                                        text_color="black",
                                        command=lambda: self.cli_command([["clear counters", r"confirm"], ["\n", ""]],
                                                                         True))
-        self.output_text = scrolledtext.ScrolledText(self, background="gray", width=100, height=14, font="Arial 12",
-                                                     cursor="", wrap=ctk.WORD, state=ctk.DISABLED)
+        self.output_text = OutputConsole(self, background="gray", width=100, height=14, font="Arial 12",
+                                         cursor="", wrap=ctk.WORD, state=ctk.DISABLED)
 
         # Place Objects
         self.close_button.grid(row=0, column=11, padx=PAD_X, pady=PAD_Y, sticky="e")
@@ -545,6 +1554,19 @@ class App2Frame(ctk.CTkFrame):
         self.site_selection.grid(row=5, column=1, padx=PAD_X, pady=PAD_Y)
         self.device_selection.grid(row=5, column=2, padx=PAD_X, pady=PAD_Y)
         self.ip_address.grid(row=5, column=3, padx=PAD_X, pady=PAD_Y)
+        self.fan_out.grid(row=6, column=1, padx=PAD_X, pady=PAD_Y)
+        self.targets_button.grid(row=6, column=2, padx=PAD_X, pady=PAD_Y)
+        self.targets_label.grid(row=6, column=3, padx=PAD_X, pady=PAD_Y)
+        self.stream_output.grid(row=7, column=1, padx=PAD_X, pady=PAD_Y)
+        self.force_refresh.grid(row=7, column=2, padx=PAD_X, pady=PAD_Y)
+        self.queue_label.grid(row=8, column=1, padx=PAD_X, pady=PAD_Y)
+        self.cancel_button.grid(row=8, column=2, padx=PAD_X, pady=PAD_Y)
+        self.bulk_button.grid(row=8, column=3, padx=PAD_X, pady=PAD_Y)
+        self.site_filter.grid(row=9, column=1, padx=PAD_X, pady=PAD_Y)
+        self.inventory_button.grid(row=9, column=2, padx=PAD_X, pady=PAD_Y)
+        self.inventory_label.grid(row=9, column=3, padx=PAD_X, pady=PAD_Y)
+        self.queue_poll_id = self.after(QUEUE_POLL_MS, self.update_queue_depth)
+        self.state_poll_id = self.after(STATE_POLL_MS, self.update_connection_state)
         self.connect_button.grid(row=12, column=1, columnspan=3, padx=PAD_X, pady=PAD_Y)
         self.command_1.grid(row=15, column=1, padx=PAD_X, pady=PAD_Y)
         self.command_2.grid(row=15, column=2, padx=PAD_X, pady=PAD_Y)
@@ -553,137 +1575,205 @@ class App2Frame(ctk.CTkFrame):
         self.command_5.grid(row=16, column=2, padx=PAD_X, pady=PAD_Y)
         self.command_6.grid(row=16, column=3, padx=PAD_X, pady=PAD_Y)
         self.output_text.grid(row=14, column=0, columnspan=12, pady=(PAD_Y, PAD_Y*2), sticky="ew")
+        self.load_inventory_file(None)
+
+    def destroy(self):
+        # Release the device sessions along with the widgets so a closed applet does not keep them open
+        self.after_cancel(self.queue_poll_id)
+        self.after_cancel(self.state_poll_id)
+        for after_id in (self.filter_id, self.inventory_poll_id):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        self.session_pool.close_all()
+        super().destroy()
+
+    def schedule_site_filter(self, event=None):
+        # Filter once typing pauses rather than on every key
+        if self.filter_id is not None:
+            self.after_cancel(self.filter_id)
+        self.filter_id = self.after(TYPE_AHEAD_MS, self.apply_site_filter)
+
+    def apply_site_filter(self):
+        self.filter_id = None
+        sites = inventory.search_sites(self.site_filter.get().strip())
+        self.site_selection.configure(values=["None"] + sites)
+        if self.site_selection.get() not in sites:
+            self.site_selection.set(sites[0] if len(sites) == 1 else "None")
+            self.select_site(self.site_selection.get())
+
+    def select_site(self, site):
+        roles = inventory.roles(site)
+        self.device_selection.configure(values=["None"] + roles)
+        self.device_selection.set(roles[0] if len(roles) == 1 else "None")
+
+    def load_inventory(self):
+        file_path = filedialog.askopenfilename(filetypes=[("Inventory", "*.csv *.json")])
+        if file_path:
+            self.load_inventory_file(file_path)
+
+    def load_inventory_file(self, file_path):
+        """Parses an inventory file (the default ones for None) on a worker thread; the menus refresh when it ends."""
+        outcome = []  # (device count, error), appended by the worker
+
+        def load():
+            try:
+                count = inventory.load_default() if file_path is None else len(inventory.load(file_path))
+                outcome.append((count, None))
+            except (OSError, ValueError, csv.Error, UnicodeDecodeError) as e:
+                outcome.append((0, e))
+
+        def loaded():
+            if not outcome:
+                self.inventory_poll_id = self.after(QUEUE_POLL_MS, loaded)
+                return
+            self.inventory_poll_id = None
+            count, error = outcome[0]
+            self.inventory_button.configure(state="normal")
+            self.inventory_label.configure(text=f"{len(inventory)} devices")
+            if error is not None:
+                self.master.generate_popup("Error", f"Unable to load the inventory: {error}")
+                return
+            if file_path is not None:
+                self.add_output(f"\nLoaded {count} devices from {os.path.basename(file_path)}.")
+            self.apply_site_filter()
+
+        self.inventory_button.configure(state="disabled")
+        self.inventory_label.configure(text="Loading inventory...")
+        threading.Thread(target=load, daemon=True).start()
+        self.inventory_poll_id = self.after(QUEUE_POLL_MS, loaded)
+
+    def update_queue_depth(self):
+        self.queue_label.configure(text=f"Queue: {self.session_pool.queue_depth()}")
+        self.queue_poll_id = self.after(QUEUE_POLL_MS, self.update_queue_depth)
 
     def cli_command(self, command, confirm=False):
-        def execute_command():
-            if hasattr(self, "ssh_client") and self.ssh_client.is_alive():
-                try:
-                    if confirm:
-                        print("Confirmed")
-                        self.ssh_client.send_multiline(command)
-                        output = f"\n!!!!! Counters cleared !!!!!"
-                    else:
-                        output = self.ssh_client.send_command(command, use_textfsm=True)
-                        print(output)
-
-                    if len(output) == 0:
-                        self.add_output(f"\n!!!!! No information returned !!!!!")
-                    elif isinstance(output, list):
-                        for k, v in output[0].items():
-                            converted_text = f"\n{k.title()}: {v}"
-                            self.add_output(converted_text)
-                    else:
-                        self.add_output(f"\n{output}")
-                except Exception as e:
-                    self.add_output(f"\n!!!!! Error sending command: {e} !!!!!")
-            else:
-                self.add_output("\n!!!!! SSH connection is not active. Unable to send the command. !!!!!")
-
-        command_thread = threading.Thread(target=execute_command)
-        command_thread.start()
+        if self.fan_out.get():
+            self.run_fan_out(command, confirm)
+            return
+        user = self.username.get().strip()
+        pwd = self.password.get().strip()
+        ip = self.get_ip()
+        stream = self.stream_output.get() and not confirm
+        force = bool(self.force_refresh.get())
+        if not (validate_ip(ip) and user and pwd):
+            self.add_output("\n!!!!! Enter credentials and select a device to send the command. !!!!!")
+            return
+
+        if stream:
+            self.add_output("\n")
+            self.session_pool.submit(ip, user, pwd,
+                                     lambda connection: stream_device_command(connection, command, self.add_output),
+                                     callback=self.report_command_error)
+            return
+        cached = None if confirm or force else self.command_cache.get(ip, command)
+        if cached is not None:
+            self.add_output(format_cache_age(cached[1]) + format_command_output(cached[0]))
+            return
+
+        def command_done(job):
+            if job.error is not None:
+                self.report_command_error(job)
+                return
+            if not confirm:
+                self.command_cache.put(ip, command, job.result)
+            self.add_output(format_command_output(job.result))
+
+        # Queued on the device's own session worker; nothing here waits for the device. Show commands are
+        # resent if the session drops mid-command, but a confirm command may already have run
+        self.session_pool.submit(ip, user, pwd, lambda connection: run_device_command(connection, command, confirm),
+                                 callback=command_done, retry=not confirm)
+
+    def report_command_error(self, job):
+        if isinstance(job.error, CancelledError):
+            self.add_output(f"\n!!!!! {job.error} !!!!!")
+        elif job.error is not None:
+            self.add_output(f"\n!!!!! Error sending command: {job.error} !!!!!")
+
+    def run_fan_out(self, command, confirm=False):
+        """Runs one command on every selected target through a bounded pool of connections.
+
+        Connection setup overlaps across devices, so the total time tracks the slowest device."""
+        user = self.username.get().strip()
+        pwd = self.password.get().strip()
+        targets = list(self.targets)
+        force = bool(self.force_refresh.get())
+        if not (targets and user and pwd):
+            self.add_output("\n!!!!! Enter credentials and select at least one target for fan-out. !!!!!")
+            return
+
+        def run_on_target(name, ip):
+            start = time.perf_counter()
+            output, age = self.run_cached(ip, user, pwd, command, confirm, force)
+            return format_cache_age(age) + format_command_output(output), time.perf_counter() - start
+
+        def execute_fan_out():
+            start = time.perf_counter()
+            self.add_output(f"\n" + "*" * 45 + f"\nRunning '{command}' on {len(targets)} devices...")
+            with ThreadPoolExecutor(max_workers=min(FAN_OUT_WORKERS, len(targets))) as executor:
+                futures = {executor.submit(run_on_target, name, ip): (name, ip) for name, ip in targets}
+                for future in as_completed(futures):
+                    name, ip = futures[future]
+                    try:
+                        output, elapsed = future.result()
+                        self.add_output(f"\n----- {name} ({ip}) {elapsed:.1f}s -----" + output)
+                    except Exception as e:
+                        self.add_output(f"\n----- {name} ({ip}) -----\n!!!!! {e} !!!!!", "firebrick4")
+            self.add_output(f"\nFan-out finished in {time.perf_counter() - start:.1f}s.\n" + "*" * 45)
+
+        threading.Thread(target=execute_fan_out, daemon=True).start()
+
+    def run_cached(self, ip, user, pwd, command, confirm=False, force=False):
+        """Returns (output, age) from the result cache, or runs the command on the pooled session (age None)."""
+        if not (confirm or force):
+            cached = self.command_cache.get(ip, command)
+            if cached is not None:
+                return cached
+        output = self.session_pool.run(ip, user, pwd,
+                                       lambda connection: run_device_command(connection, command, confirm),
+                                       retry=not confirm)
+        if not confirm:
+            self.command_cache.put(ip, command, output)
+        return output, None
+
+    def select_targets(self):
+        TargetSelector(self, self.targets, self.set_targets)
+
+    def set_targets(self, targets):
+        self.targets = targets
+        self.targets_label.configure(text=f"{len(targets)} targets")
 
     def add_output(self, text, color="black"):
-        # Temporarily enable the ScrolledText widget to insert text
-        self.output_text.config(state=ctk.NORMAL)  # Set state to NORMAL allowing text insertion
-
-        # Create a tag with the desired color
-        tag_name = f"{color}_tag"  # Generate a unique tag name for each color
-        self.output_text.tag_configure(tag_name, foreground=color)
-
-        # Insert text at the end and apply the tag
-        self.output_text.insert(ctk.END, text, tag_name)  # Apply color to inserted text
-        self.output_text.see(ctk.END)
-
-        # Disable the widget again after inserting
-        self.output_text.config(state=ctk.DISABLED)  # Disable the widget again after inserting
+        # Safe from any thread; the console inserts queued text on its next frame
+        self.output_text.append(text, color)
 
     def ssh_connection(self):
-        def validate_ip(_):
-            try:
-                ipaddress.ip_address(_)
-                return True
-            except ValueError:
-                return False
-
-        def establishing_connect_button():
-            self.connect_button.configure(
-                text="Establishing...",
-                text_color="black",
-                fg_color="gold2",
-                hover_color="gold3",
-                command=connect_or_disconnect,
-            )
-
-        def disconnect_connect_button():
-            self.connect_button.configure(
-                text="Disconnect",
-                fg_color="firebrick3",
-                hover_color="firebrick4",
-                command=connect_or_disconnect,
-            )
-
-        def reset_connect_button():
-            self.connect_button.configure(
-                text="Connect",
-                text_color=self.default_button_text_color,
-                fg_color=self.default_button_fg_color,
-                hover_color=self.default_button_hover_color,
-                command=connect_or_disconnect,
-            )
-
-        def connect_or_disconnect():
-            if self.connect_button.cget("text") == "Connect":
-                # Connect logic
-                def connect():
-                    try:
-                        switch = {
-                            "device_type": "cisco_ios",
-                            "ip": ip,
-                            "username": user,
-                            "password": pwd,
-                            "secret": pwd,
-                        }
-
-                        if validate_ip(ip) and user and pwd:
-                            try:
-                                self.add_output(f"\nAttempting to connect to {ip}...")
-                                establishing_connect_button()
-                                self.ssh_client = netmiko.ConnectHandler(**switch)
-                                disconnect_connect_button()
-                                self.add_output(f"\nConnected to {ip} successfully!")
-                            except paramiko.SSHException as ssh_e:
-                                self.add_output(str(ssh_e))
-                                reset_connect_button()
-                        else:
-                            self.add_output(
-                                "\nPlease verify that credentials are entered and the IP or selection is correct."
-                            )
-                    except ValueError as ve:
-                        self.add_output(f"\nError: {ve}")
-                        reset_connect_button()
-                    except Exception as rand_e:
-                        self.add_output(f"\nUnexpected error: {rand_e}")
-                        reset_connect_button()
-
-                self.connection_thread = threading.Thread(target=connect)
-                self.connection_thread.start()
-            else:
-                # Disconnect logic
-                if hasattr(self, "ssh_client"):
-                    try:
-                        self.ssh_client.disconnect()
-                        self.add_output("\n" + "*" * 45 + "\nDisconnected successfully.\n" + "*" * 45)
-                    except Exception as e:
-                        self.add_output(f"\n!!!!! Error during disconnect: {e} !!!!!")
-
-                else:
-                    print(f"Connection alive = {self.ssh_client.is_alive()}")
-                reset_connect_button()
-        user = self.username.get().strip()
-        pwd = self.password.get().strip()
-        ip = self.get_ip()
+        """Connect button handler. It only starts the work; the result arrives through update_connection_state."""
+        state = self.connection.state
         self.add_output(f"\n" + "*" * 45)
-        connect_or_disconnect()
+        if state in (ConnectionLifecycle.IDLE, ConnectionLifecycle.FAILED):
+            user = self.username.get().strip()
+            pwd = self.password.get().strip()
+            ip = self.get_ip()
+            if not (validate_ip(ip) and user and pwd):
+                self.add_output("\nPlease verify that credentials are entered and the IP or selection is correct.")
+                return
+            self.add_output(f"\nAttempting to connect to {ip}...")
+            self.connection.connect(ip, user, pwd)
+        elif state != ConnectionLifecycle.DISCONNECTING:
+            # Also aborts a login that is still in progress
+            self.connection.disconnect()
+        self.render_connection_state()
+
+    def update_connection_state(self):
+        messages = self.connection.poll()
+        for message in messages:
+            self.add_output(message)
+        if messages:
+            self.render_connection_state()
+        self.state_poll_id = self.after(STATE_POLL_MS, self.update_connection_state)
+
+    def render_connection_state(self):
+        self.connect_button.configure(**self.connect_button_styles[self.connection.state])
 
     def get_ip(self):
         ip = self.ip_address.get().strip()
@@ -691,13 +1781,810 @@ class App2Frame(ctk.CTkFrame):
         device_type = self.device_selection.get().strip()
         if ip:
             return ip
-        elif site != "None" and device_type != "None":
-            if device_type == "Core":
-                return self.device_dict[site][0]
-            elif device_type == "WLC":
-                return self.device_dict[site][1]
+        return inventory.lookup(site, device_type) or "None selected"
+
+
+def device_params(ip, user, pwd):
+    """netmiko ConnectHandler arguments for one of our Cisco IOS devices."""
+    return {
+        "device_type": "cisco_ios",
+        "ip": ip,
+        "username": user,
+        "password": pwd,
+        "secret": pwd,
+        "conn_timeout": CONNECT_TIMEOUT,
+        "banner_timeout": CONNECT_TIMEOUT,
+        "auth_timeout": CONNECT_TIMEOUT,
+    }
+
+
+known_hosts_classes = {}  # netmiko device type -> connection class using known_hosts as its host key policy
+
+
+def connect_device(params, **kwargs):
+    """Opens a netmiko session whose host key is checked against the shared known hosts before login."""
+    device_type = params["device_type"]
+    connection_class = known_hosts_classes.get(device_type)
+    if connection_class is None:
+        base_class = netmiko.ssh_dispatcher(device_type)
+
+        def build_ssh_client(connection):
+            # netmiko would install AutoAddPolicy here; paramiko calls the policy for every host since
+            # the client's own host key list is empty, so each key goes through known_hosts.verify
+            client = base_class._build_ssh_client(connection)
+            client.set_missing_host_key_policy(known_hosts)
+            return client
+
+        connection_class = type(base_class.__name__, (base_class,), {"_build_ssh_client": build_ssh_client})
+        known_hosts_classes[device_type] = connection_class
+    return connection_class(**params, **kwargs)
+
+
+def validate_ip(ip):
+    try:
+        ipaddress.ip_address(ip)
+        return True
+    except ValueError:
+        return False
+
+
+def run_device_command(connection, command, confirm=False):
+    """Sends a command on an open netmiko connection; `confirm` commands are a list of [command, expect] pairs."""
+    if confirm:
+        connection.send_multiline(command)
+        return f"\n!!!!! Counters cleared !!!!!"
+    # Parsed here rather than with use_textfsm=True so compiled templates are reused between calls
+    return textfsm_parser.parse(command, connection.send_command(command))
+
+
+def stream_device_command(connection, command, on_chunk, read_timeout=STREAM_READ_TIMEOUT):
+    """Sends a command and passes its raw output to `on_chunk` as it arrives instead of waiting for all of it.
+
+    Returns once the device prompt comes back. Output is not kept here, so memory does not grow with it."""
+    prompt = re.compile(re.escape(connection.base_prompt) + r"[>#]\s*$")
+    connection.clear_buffer()
+    connection.write_channel(command + connection.RETURN)
+    tail = ""
+    deadline = time.monotonic() + read_timeout
+    while time.monotonic() < deadline:
+        data = connection.read_channel()
+        if not data:
+            time.sleep(0.02)
+            continue
+        on_chunk(data.replace("\r", ""))
+        tail = (tail + data)[-256:]  # Only the end is needed to spot the returning prompt
+        if prompt.search(tail):
+            return
+        deadline = time.monotonic() + read_timeout
+    raise TimeoutError(f"No output for {read_timeout}s while streaming '{command}'")
+
+
+def format_cache_age(age):
+    return "" if age is None else f"\n(cached {age:.0f}s ago - tick Force refresh to re-run)"
+
+
+class CommandCache:
+    """Recent command results keyed by (device, command), each kept for its command's TTL."""
+
+    def __init__(self, ttls=None):
+        self.ttls = COMMAND_CACHE_TTLS if ttls is None else ttls
+        self.entries = {}  # (ip, command) -> (output, stored at)
+        self.lock = threading.Lock()
+
+    def ttl(self, command):
+        for prefix, ttl in self.ttls.items():
+            if command.startswith(prefix):
+                return ttl
+        return 0
+
+    def get(self, ip, command):
+        """Returns (output, age in seconds) if a fresh entry exists, else None."""
+        with self.lock:
+            entry = self.entries.get((ip, command))
+        if entry is None:
+            return None
+        age = time.monotonic() - entry[1]
+        return (entry[0], age) if age < self.ttl(command) else None
+
+    def put(self, ip, command, output):
+        if self.ttl(command):
+            with self.lock:
+                self.entries[(ip, command)] = (output, time.monotonic())
+
+
+class TextFsmParser:
+    """Parses command output with the ntc-templates TextFSM templates netmiko uses.
+
+    netmiko's use_textfsm reads the template index and recompiles the template files on every call.
+    Here the index is loaded once and each compiled template is kept in memory and reset between
+    parses. Index entries naming several templates are merged on their Key values, as CliTable does.
+    Output with no matching template, or that the template finds nothing in, is returned unchanged."""
+
+    def __init__(self, platform="cisco_ios"):
+        self.platform = platform
+        self.index = None
+        self.template_dir = None
+        self.templates = {}  # template file -> (TextFSM, lock)
+        self.lock = threading.Lock()
+
+    def templates_for(self, command):
+        """The compiled (TextFSM, lock) pairs for every template the index lists for `command`."""
+        with self.lock:
+            if self.index is None:
+                self.template_dir = netmiko_utilities.get_template_dir()
+                self.index = clitable.CliTable("index", self.template_dir).index
+            row = self.index.GetRowMatch({"Platform": self.platform, "Command": command})
+            if not row:
+                return []
+            template_files = self.index.index[row]["Template"].split(":")
+            for template_file in template_files:
+                if template_file not in self.templates:
+                    with open(os.path.join(self.template_dir, template_file)) as template:
+                        self.templates[template_file] = (textfsm.TextFSM(template), threading.Lock())
+            return [self.templates[template_file] for template_file in template_files]
+
+    def parse(self, command, output):
+        templates = self.templates_for(command)
+        if not templates:
+            return output
+        table = None
+        keys = []
+        for fsm, lock in templates:
+            with lock:
+                fsm.Reset()
+                try:
+                    rows = [dict(zip(fsm.header, row)) for row in fsm.ParseText(output)]
+                except textfsm.TextFSMError:
+                    return output
+                if table is None:
+                    table, header, keys = rows, list(fsm.header), fsm.GetValuesByAttrib("Key")
+                    continue
+                extra = [column for column in fsm.header if column not in header]
+            if not extra:
+                continue
+            header += extra
+            # Like CliTable: join on the first template's Key values, or row by row when it has none
+            for position, row in enumerate(table):
+                if keys:
+                    match = next((other for other in rows if all(other[k] == row[k] for k in keys)), None)
+                else:
+                    match = rows[position] if position < len(rows) else None
+                for column in extra:
+                    row[column] = match[column] if match is not None else ""
+        if not table:
+            return output
+        return [{column.lower(): row[column] for column in header} for row in table]
+
+
+textfsm_parser = TextFsmParser()
+
+
+def format_command_output(output):
+    if len(output) == 0:
+        return f"\n!!!!! No information returned !!!!!"
+    elif isinstance(output, list):
+        return "".join(f"\n{k.title()}: {v}" for k, v in output[0].items())
+    else:
+        return f"\n{output}"
+
+
+class OutputConsole(scrolledtext.ScrolledText):
+    """Read-only output pane that stays responsive over a full-day session.
+
+    `append()` only queues text, so it is safe from worker threads. Once per frame everything queued is
+    inserted with a single Text.insert call, colour tags are configured the first time each colour is
+    seen, and lines beyond `max_lines` are trimmed from the top. Everything shown is also appended to a
+    history file, rotated at LOG_MAX_BYTES like the app log, so trimming never loses recent output and
+    the history never grows without bound."""
+
+    def __init__(self, master, max_lines=CONSOLE_MAX_LINES, history_path=CONSOLE_HISTORY_FILE, **kwargs):
+        super().__init__(master, **kwargs)
+        self.max_lines = max_lines
+        self.pending = q.SimpleQueue()
+        self.tags = set()
+        self.history = logging.handlers.RotatingFileHandler(history_path, maxBytes=LOG_MAX_BYTES,
+                                                            backupCount=LOG_BACKUP_COUNT, encoding="utf-8")
+        self.history.terminator = ""  # Console text carries its own newlines
+        self.drain_id = self.after(CONSOLE_FLUSH_MS, self.drain)
+
+    def append(self, text, color="black"):
+        self.pending.put((text, color))
+
+    def drain(self):
+        runs = []  # [text, tag] runs with consecutive same-colour appends merged
+        while True:
+            try:
+                text, color = self.pending.get_nowait()
+            except q.Empty:
+                break
+            tag_name = f"{color}_tag"
+            if tag_name not in self.tags:
+                self.tag_configure(tag_name, foreground=color)
+                self.tags.add(tag_name)
+            if runs and runs[-1][1] == tag_name:
+                runs[-1][0] += text
+            else:
+                runs.append([text, tag_name])
+        if runs:
+            self.configure(state=ctk.NORMAL)
+            self.insert(ctk.END, *[part for run in runs for part in run])
+            excess = int(self.index("end-1c").split(".")[0]) - self.max_lines
+            if excess > 0:
+                self.delete("1.0", f"{excess + 1}.0")
+            self.see(ctk.END)
+            self.configure(state=ctk.DISABLED)
+            self.history.handle(logging.makeLogRecord({"msg": "".join(text for text, _ in runs)}))
+        self.drain_id = self.after(CONSOLE_FLUSH_MS, self.drain)
+
+    def destroy(self):
+        self.after_cancel(self.drain_id)
+        self.history.close()
+        super().destroy()
+
+
+class CommandJob:
+    """One unit of work queued on a SessionExecutor."""
+
+    def __init__(self, func, timeout=None, callback=None, generation=0, retry=False):
+        self.func = func
+        self.retry = retry  # Safe to run again if the session drops part way through, as a show command is
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.callback = callback  # Called with the job on the session's worker thread once it finishes
+        self.generation = generation
+        self.cancelled = False
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def expired(self):
+        return self.deadline is not None and time.monotonic() > self.deadline
+
+    def finish(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.done.set()
+        if self.callback:
+            try:
+                self.callback(self)
+            except Exception as e:
+                logging.critical(f"Command callback failed: {e}")
+
+    def wait(self):
+        """Blocks until the job finishes and returns its result, raising its error instead if it failed."""
+        timeout = None if self.deadline is None else max(0.0, self.deadline - time.monotonic())
+        if not self.done.wait(timeout):
+            self.cancel()
+            raise TimeoutError("Command timed out")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SessionExecutor:
+    """Owns one device session and the only thread that ever touches it.
+
+    Jobs run strictly in submission order on the session's worker, so quick clicks queue up instead of
+    driving the channel from several threads at once. Queued jobs can be cancelled and expire if they
+    wait past their timeout. A dead session is logged back into before the next job. A job that fails
+    because the session dropped while it ran is retried once only if it was submitted with `retry`;
+    anything else may already have reached the device, so the drop is reported for the user to resend."""
+    CLOSE = object()
+
+    def __init__(self, params, keepalive=SESSION_KEEPALIVE):
+        self.params = params
+        self.keepalive = keepalive
+        self.connection = None
+        self.jobs = q.Queue()
+        self.generation = 0  # Bumped by cancel_pending(); jobs from an older generation are skipped
+        self.busy = False
+        self.last_used = time.monotonic()
+        self.on_closed = []  # Called on the worker once the session has disconnected
+        threading.Thread(target=self.work, daemon=True, name=f"session-{params['ip']}").start()
+
+    def submit(self, func, timeout=COMMAND_TIMEOUT, callback=None, retry=False):
+        job = CommandJob(func, timeout, callback, self.generation, retry)
+        self.jobs.put(job)
+        return job
+
+    def depth(self):
+        return self.jobs.qsize() + self.busy
+
+    def cancel_pending(self):
+        self.generation += 1
+
+    def close(self, callback=None):
+        """Disconnects once the jobs already queued have run, then calls `callback`."""
+        if callback:
+            self.on_closed.append(callback)
+        self.jobs.put(self.CLOSE)
+
+    def work(self):
+        while True:
+            job = self.jobs.get()
+            if job is self.CLOSE:
+                self.disconnect()
+                for callback in self.on_closed:
+                    callback()
+                break
+            if job.cancelled or job.generation < self.generation:
+                job.finish(error=CancelledError("Command cancelled"))
+                continue
+            if job.expired():
+                job.finish(error=TimeoutError("Command timed out waiting in the queue"))
+                continue
+            self.busy = True
+            try:
+                result = self.execute(job.func, job.retry)
+            except Exception as e:
+                job.finish(error=e)
+            else:
+                job.finish(result=result)
+            finally:
+                self.busy = False
+                self.last_used = time.monotonic()
+        # Anything submitted after close() never runs
+        while not self.jobs.empty():
+            job = self.jobs.get_nowait()
+            if job is not self.CLOSE:
+                job.finish(error=CancelledError("Session closed"))
+
+    def execute(self, func, retry=False):
+        for attempt in range(2):
+            if self.connection is None or not self.connection.is_alive():
+                if self.connection is not None:
+                    logging.warning(f"Pooled session to {self.params['ip']} dropped, reconnecting.")
+                    self.disconnect()
+                self.connection = connect_device(self.params, keepalive=self.keepalive)
+            try:
+                return func(self.connection)
+            except Exception as e:
+                if attempt or self.connection.is_alive():
+                    raise
+                if not retry:
+                    raise ConnectionError(f"Session to {self.params['ip']} dropped while the command was running; "
+                                          f"it was not resent") from e
+                logging.warning(f"Pooled session to {self.params['ip']} dropped mid-command, running it again.")
+
+    def disconnect(self):
+        if self.connection is not None:
+            try:
+                self.connection.disconnect()
+            except Exception as e:
+                logging.warning(f"Error closing pooled session to {self.params['ip']}: {e}")
+            self.connection = None
+
+
+class SessionPool:
+    """Keeps authenticated netmiko sessions to recently used devices open for reuse.
+
+    Each session is a SessionExecutor keyed by (ip, username). The least recently used one is closed
+    once `max_sessions` is exceeded, and a reaper thread closes sessions idle for `idle_timeout`
+    seconds; pinned sessions are skipped by both and stay open until close() is called for them.
+    Keepalives hold idle sessions open, and a dead session is logged back into without the caller
+    noticing."""
+
+    def __init__(self, max_sessions=SESSION_POOL_SIZE, idle_timeout=SESSION_IDLE_TIMEOUT,
+                 keepalive=SESSION_KEEPALIVE):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.keepalive = keepalive
+        self.sessions = OrderedDict()  # Least recently used first
+        self.pinned = set()  # Keys never evicted or reaped, such as the session App2Frame's Connect button owns
+        self.lock = threading.Lock()
+        self.stop = threading.Event()
+        threading.Thread(target=self.reap_idle, daemon=True).start()
+
+    def checkout(self, ip, user, pwd):
+        with self.lock:
+            session = self.sessions.get((ip, user))
+            if session is None:
+                session = self.sessions[(ip, user)] = SessionExecutor(device_params(ip, user, pwd), self.keepalive)
+            else:
+                session.params["password"] = session.params["secret"] = pwd
+            self.sessions.move_to_end((ip, user))
+            if len(self.sessions) > self.max_sessions:
+                evict = [key for key in self.sessions if key not in self.pinned]
+                for key in evict[:len(self.sessions) - self.max_sessions]:
+                    self.sessions.pop(key).close()
+        return session
+
+    def pin(self, ip, user):
+        """Keeps the (ip, user) session out of eviction and idle reaping until close() is called for it."""
+        with self.lock:
+            self.pinned.add((ip, user))
+
+    def submit(self, ip, user, pwd, func, timeout=COMMAND_TIMEOUT, callback=None, retry=False):
+        """Queues `func(connection)` on the device's session without blocking the caller."""
+        return self.checkout(ip, user, pwd).submit(func, timeout, callback, retry)
+
+    def run(self, ip, user, pwd, func, timeout=COMMAND_TIMEOUT, retry=False):
+        """Runs `func(connection)` on the device's session and waits for the result."""
+        return self.submit(ip, user, pwd, func, timeout, retry=retry).wait()
+
+    def queue_depth(self):
+        with self.lock:
+            return sum(session.depth() for session in self.sessions.values())
+
+    def cancel_pending(self):
+        with self.lock:
+            for session in self.sessions.values():
+                session.cancel_pending()
+
+    def close(self, ip, user, callback=None):
+        """Drops queued jobs for the session and disconnects it off the caller's thread."""
+        with self.lock:
+            session = self.sessions.pop((ip, user), None)
+            self.pinned.discard((ip, user))
+        if session is not None:
+            session.cancel_pending()
+            session.close(callback)
+        elif callback:
+            callback()
+
+    def close_all(self):
+        self.stop.set()
+        with self.lock:
+            for session in self.sessions.values():
+                session.cancel_pending()
+                session.close()
+            self.sessions.clear()
+            self.pinned.clear()
+
+    def reap_idle(self):
+        while not self.stop.wait(min(self.idle_timeout, 30)):
+            now = time.monotonic()
+            with self.lock:
+                idle = [key for key, session in self.sessions.items() if key not in self.pinned
+                        and now - session.last_used > self.idle_timeout and not session.depth()]
+                for key in idle:
+                    self.sessions.pop(key).close()
+
+
+class ConnectionLifecycle:
+    """State of the session opened by App2Frame's Connect button.
+
+    idle -> connecting -> connected -> disconnecting -> idle, with failed reached from connecting. Login
+    and disconnect run on the session's worker thread and only post events here; poll() is called from
+    the Tk main loop and is the only place the state changes. Logins past CONNECT_DEADLINE and
+    disconnects past DISCONNECT_TIMEOUT are abandoned, so a wedged device never holds the UI."""
+    IDLE, CONNECTING, CONNECTED, DISCONNECTING, FAILED = "idle", "connecting", "connected", "disconnecting", "failed"
+
+    def __init__(self, session_pool):
+        self.session_pool = session_pool
+        self.state = self.IDLE
+        self.key = None  # (ip, username)
+        self.attempt = 0  # Events from an earlier connect or disconnect are ignored
+        self.deadline = None
+        self.events = q.SimpleQueue()
+
+    def connect(self, ip, user, pwd):
+        self.attempt += 1
+        attempt = self.attempt
+        self.key = (ip, user)
+        self.state = self.CONNECTING
+        self.deadline = time.monotonic() + CONNECT_DEADLINE
+        # Pinned so the pool cannot evict or reap the session behind this state; close() releases it
+        self.session_pool.pin(ip, user)
+        # The login runs as the first job on the device's session worker
+        self.session_pool.submit(ip, user, pwd, lambda connection: None, timeout=CONNECT_DEADLINE,
+                                 callback=lambda job: self.events.put((attempt, job.error)))
+
+    def disconnect(self):
+        self.attempt += 1
+        attempt = self.attempt
+        self.state = self.DISCONNECTING
+        self.deadline = time.monotonic() + DISCONNECT_TIMEOUT
+        self.session_pool.close(*self.key, callback=lambda: self.events.put((attempt, None)))
+
+    def poll(self):
+        """Applies finished work and expired deadlines; returns messages for the output pane."""
+        messages = []
+        while not self.events.empty():
+            attempt, error = self.events.get()
+            if attempt != self.attempt:
+                continue
+            if self.state == self.CONNECTING and error is None:
+                self.state = self.CONNECTED
+                messages.append(f"\nConnected to {self.key[0]} successfully!")
+            elif self.state == self.CONNECTING:
+                self.state = self.FAILED
+                self.session_pool.close(*self.key)
+                messages.append(f"\nUnable to connect to {self.key[0]}: {error}")
+            elif self.state == self.DISCONNECTING:
+                self.state = self.IDLE
+                messages.append("\nDisconnected successfully.\n" + "*" * 45)
+            self.deadline = None
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            self.attempt += 1
+            self.deadline = None
+            if self.state == self.CONNECTING:
+                self.state = self.FAILED
+                self.session_pool.close(*self.key)
+                messages.append(f"\nUnable to connect to {self.key[0]}: timed out after {CONNECT_DEADLINE}s")
+            else:
+                self.state = self.IDLE
+                logging.warning(f"Disconnect from {self.key[0]} did not finish, leaving it to the session worker.")
+                messages.append(f"\nDisconnect from {self.key[0]} timed out; the session was abandoned.\n" + "*" * 45)
+        return messages
+
+
+class BulkCollector:
+    """Runs a list of commands on every device in a CSV or JSON file and writes each TextFSM record to one file.
+
+    Devices are worked through a pool of `workers` connections, and records are written as each
+    device finishes, so nothing accumulates in memory. A `.csv` output has one row per record field
+    (Device_Name, IP_Address, Command, Record, Field, Value); any other extension gets one JSON object
+    per record per line. Per-device timing and failures go to a `_report.csv` next to the output."""
+    REPORT_COLUMNS = ["Device_Name", "IP_Address", "Status", "Connect_Seconds", "Total_Seconds", "Records", "Error"]
+
+    def __init__(self, devices_path, commands, user, pwd, output_path, workers=FAN_OUT_WORKERS):
+        self.devices_path = devices_path
+        self.commands = commands
+        self.user = user
+        self.pwd = pwd
+        self.output_path = output_path
+        self.report_path = f"{os.path.splitext(output_path)[0]}_report.csv"
+        self.workers = max(1, workers)
+        self.completed = 0
+        self.failed = 0
+        self.records = 0
+        self.error = None
+        self.finished = False
+
+    def collect_device(self, device):
+        """Runs every command on one device; returns (records, report row)."""
+        start = time.perf_counter()
+        report = {"Device_Name": device["Device_Name"], "IP_Address": device["IP_Address"], "Status": "Success",
+                  "Connect_Seconds": "", "Total_Seconds": "", "Records": 0, "Error": ""}
+        records = []
+        try:
+            connection = connect_device(device_params(device["IP_Address"], self.user, self.pwd))
+            report["Connect_Seconds"] = round(time.perf_counter() - start, 2)
+            try:
+                for command in self.commands:
+                    output = textfsm_parser.parse(command, connection.send_command(command))
+                    for record in output if isinstance(output, list) else [{"output": output}]:
+                        records.append((command, record))
+            finally:
+                connection.disconnect()
+        except Exception as e:
+            report["Status"] = "Failure"
+            report["Error"] = str(e)
+        report["Total_Seconds"] = round(time.perf_counter() - start, 2)
+        report["Records"] = len(records)
+        return device, records, report
+
+    def write_records(self, output_file, device, records):
+        as_csv = self.output_path.lower().endswith(".csv")
+        writer = csv.writer(output_file)
+        for record_number, (command, record) in enumerate(records):
+            if as_csv:
+                writer.writerows([device["Device_Name"], device["IP_Address"], command, record_number, field, value]
+                                 for field, value in record.items())
             else:
-                return "None selected"
+                output_file.write(json.dumps({"Device_Name": device["Device_Name"],
+                                              "IP_Address": device["IP_Address"], "Command": command,
+                                              "Record": record}) + "\n")
+
+    def run(self):
+        logging.warning(f"Bulk collection of {len(self.commands)} commands from {self.devices_path} started.")
+        with open(self.output_path, "w", newline="") as output_file, \
+                open(self.report_path, "w", newline="") as report_file:
+            if self.output_path.lower().endswith(".csv"):
+                csv.writer(output_file).writerow(["Device_Name", "IP_Address", "Command", "Record", "Field", "Value"])
+            report = csv.DictWriter(report_file, fieldnames=self.REPORT_COLUMNS)
+            report.writeheader()
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bulk") as executor:
+                pending = set()
+                devices = (device for device in inventory.iter_indexed(self.devices_path) if "Invalid" not in device)
+                for device in devices:
+                    pending.add(executor.submit(self.collect_device, device))
+                    # Keep only a small window of devices in flight so large inventories stay flat in memory
+                    if len(pending) >= self.workers * 2:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        self.write_done(done, output_file, report)
+                self.write_done(pending, output_file, report, wait_all=True)
+        self.finished = True
+        logging.warning(f"Bulk collection wrote {self.records} records to {self.output_path}; "
+                        f"{self.failed} of {self.completed} devices failed.")
+
+    def write_done(self, futures, output_file, report, wait_all=False):
+        for future in as_completed(futures) if wait_all else futures:
+            device, records, report_row = future.result()
+            self.write_records(output_file, device, records)
+            report.writerow(report_row)
+            output_file.flush()
+            self.completed += 1
+            self.records += len(records)
+            self.failed += report_row["Status"] != "Success"
+
+
+class BulkCollectWindow(ctk.CTkToplevel):
+    """Popup that runs a BulkCollector with App2Frame's credentials."""
+
+    def __init__(self, master):
+        super().__init__(master)
+        self.app = master
+        self.devices_path = ""
+        self.collector = None
+        self.status_id = None
+
+        # Popup UI
+        self.title("Bulk Collect")
+        self.geometry("420x440")
+        self.columnconfigure([0, 1], weight=1)
+        self.rowconfigure(2, weight=1)
+
+        # Create Objects
+        self.select_file = ctk.CTkButton(self, text="Import Devices", command=self.import_csv)
+        self.file_label = ctk.CTkLabel(self, text="No file selected")
+        self.commands = ctk.CTkTextbox(self, height=150)
+        self.commands.insert("1.0", "sh version\nsh cdp nei")
+        self.workers = ctk.CTkEntry(self, placeholder_text=f"Workers ({FAN_OUT_WORKERS})")
+        self.output_format = ctk.CTkOptionMenu(self, values=["CSV", "JSON"])
+        self.start_button = ctk.CTkButton(self, text="Start", command=self.start)
+        self.status = ctk.CTkLabel(self, text="One command per line")
+
+        # Place Objects
+        self.select_file.grid(row=0, column=0, padx=PAD_X, pady=PAD_Y)
+        self.file_label.grid(row=0, column=1, padx=PAD_X, pady=PAD_Y)
+        self.commands.grid(row=2, column=0, columnspan=2, padx=PAD_X, pady=PAD_Y, sticky="nsew")
+        self.workers.grid(row=3, column=0, padx=PAD_X, pady=PAD_Y)
+        self.output_format.grid(row=3, column=1, padx=PAD_X, pady=PAD_Y)
+        self.start_button.grid(row=4, column=0, columnspan=2, padx=PAD_X, pady=PAD_Y)
+        self.status.grid(row=5, column=0, columnspan=2, padx=PAD_X, pady=PAD_Y)
+
+    def import_csv(self):
+        file_path = filedialog.askopenfilename(parent=self, filetypes=[("Inventory", "*.csv *.json")])
+        if file_path:
+            self.devices_path = file_path
+            self.file_label.configure(text=os.path.basename(file_path))
+
+    def start(self):
+        commands = [line.strip() for line in self.commands.get("1.0", ctk.END).splitlines() if line.strip()]
+        user = self.app.username.get().strip()
+        pwd = self.app.password.get().strip()
+        try:
+            workers = int(self.workers.get() or FAN_OUT_WORKERS)
+        except ValueError:
+            workers = 0
+        if not (self.devices_path and commands and user and pwd and workers > 0):
+            self.status.configure(text="Select devices, enter commands, a worker count and App2 credentials.",
+                                  text_color="firebrick1")
+            return
+        os.makedirs("Results", exist_ok=True)
+        extension = "csv" if self.output_format.get() == "CSV" else "jsonl"
+        output_path = os.path.join("Results", f"bulk_{time.strftime('%Y%m%d-%H%M%S')}.{extension}")
+        self.collector = BulkCollector(self.devices_path, commands, user, pwd, output_path, workers)
+        self.start_button.configure(state="disabled")
+        threading.Thread(target=self.run_collector, daemon=True).start()
+        self.status_id = self.after(PROGRESS_INTERVAL_MS, self.update_status)
+
+    def destroy(self):
+        # The collection itself carries on and finishes its output file; only the status polling stops
+        if self.status_id is not None:
+            self.after_cancel(self.status_id)
+        super().destroy()
+
+    def run_collector(self):
+        try:
+            self.collector.run()
+        except Exception as e:
+            logging.critical(f"Bulk collection failed: {e}")
+            self.collector.error = e
+            self.collector.finished = True
+
+    def update_status(self):
+        self.status_id = None
+        collector = self.collector
+        if collector.error is not None:
+            self.status.configure(text=f"Failed: {collector.error}", text_color="firebrick1")
+        elif collector.finished:
+            self.status.configure(text=f"Done: {collector.completed} devices, {collector.failed} failed, "
+                                       f"{collector.records} records\n{collector.output_path}", text_color="green")
+        else:
+            self.status.configure(text=f"{collector.completed} devices done, {collector.failed} failed, "
+                                       f"{collector.records} records")
+            self.status_id = self.after(PROGRESS_INTERVAL_MS, self.update_status)
+            return
+        self.start_button.configure(state="normal")
+
+
+class TargetSelector(ctk.CTkToplevel):
+    """Popup for picking the devices a fan-out command runs on, from the shared inventory or a device file.
+
+    Only the devices at the sites matching the filter, and with the chosen role, are listed, capped at
+    TARGET_LIST_LIMIT devices, so the popup stays responsive for large inventories; the selection is
+    kept across filter changes."""
+    ALL_ROLES = "All roles"
+
+    def __init__(self, master, selected, on_done):
+        super().__init__(master)
+        self.on_done = on_done
+        self.selected = dict.fromkeys(selected)  # Insertion-ordered set of (name, ip)
+        self.checkboxes = []
+        self.filter_id = None
+
+        # Popup UI
+        self.title("Select Targets")
+        self.geometry("360x460")
+        self.grab_set()
+        self.rowconfigure(1, weight=1)
+        self.columnconfigure([0, 1, 2], weight=1)
+
+        # Create Objects
+        self.site_filter = ctk.CTkEntry(self, placeholder_text="Filter sites")
+        self.site_filter.bind("<KeyRelease>", self.schedule_filter)
+        self.role_filter = ctk.CTkOptionMenu(self, values=[self.ALL_ROLES], width=110,
+                                             command=lambda role: self.show_devices())
+        self.device_list = ctk.CTkScrollableFrame(self)
+        self.import_button = ctk.CTkButton(self, text="Import File", width=80, command=self.import_file)
+        self.all_button = ctk.CTkButton(self, text="All", width=60, command=lambda: self.set_all(True))
+        self.done_button = ctk.CTkButton(self, text="Done", width=80, command=self.done)
+
+        # Place Objects
+        self.site_filter.grid(row=0, column=0, columnspan=2, padx=PAD_X, pady=PAD_Y, sticky="ew")
+        self.role_filter.grid(row=0, column=2, padx=PAD_X, pady=PAD_Y)
+        self.device_list.grid(row=1, column=0, columnspan=3, padx=PAD_X, pady=PAD_Y, sticky="nsew")
+        self.import_button.grid(row=2, column=0, padx=PAD_X, pady=PAD_Y)
+        self.all_button.grid(row=2, column=1, padx=PAD_X, pady=PAD_Y)
+        self.done_button.grid(row=2, column=2, padx=PAD_X, pady=PAD_Y)
+        self.show_devices()
+
+    def schedule_filter(self, event=None):
+        if self.filter_id is not None:
+            self.after_cancel(self.filter_id)
+        self.filter_id = self.after(TYPE_AHEAD_MS, self.show_devices)
+
+    def show_devices(self):
+        self.filter_id = None
+        for checkbox, _ in self.checkboxes:
+            checkbox.destroy()
+        self.checkboxes = []
+        self.role_filter.configure(values=[self.ALL_ROLES] + inventory.role_names())
+        role = self.role_filter.get()
+        sites = inventory.search_sites(self.site_filter.get().strip(), limit=TARGET_LIST_LIMIT)
+        for device in inventory.devices_at(sites, role=None if role == self.ALL_ROLES else role):
+            self.add_checkbox((device["Device_Name"], device["IP_Address"]))
+
+    def add_checkbox(self, target):
+        checkbox = ctk.CTkCheckBox(self.device_list, text=f"{target[0]} ({target[1]})",
+                                   command=lambda: self.toggle(target, checkbox.get()))
+        if target in self.selected:
+            checkbox.select()
+        checkbox.grid(row=len(self.checkboxes), column=0, padx=PAD_X, pady=2, sticky="w")
+        self.checkboxes.append((checkbox, target))
+
+    def toggle(self, target, checked):
+        if checked:
+            self.selected[target] = None
+        else:
+            self.selected.pop(target, None)
+
+    def import_file(self):
+        file_path = filedialog.askopenfilename(parent=self, filetypes=[("Inventory", "*.csv *.json")])
+        if file_path:
+            try:
+                for ip in inventory.load(file_path):
+                    device = inventory.device(ip)
+                    self.selected[(device["Device_Name"], device["IP_Address"])] = None
+            except (OSError, ValueError, csv.Error, UnicodeDecodeError) as e:
+                logging.critical(f"Unable to import targets from {file_path}: {e}")
+            self.show_devices()
+
+    def set_all(self, checked):
+        for checkbox, target in self.checkboxes:
+            checkbox.select() if checked else checkbox.deselect()
+            self.toggle(target, checked)
+
+    def done(self):
+        if self.filter_id is not None:
+            self.after_cancel(self.filter_id)
+        self.on_done(list(self.selected))
+        self.destroy()
 
 
 class App3Frame(ctk.CTkFrame):
@@ -712,10 +2599,21 @@ class App3Frame(ctk.CTkFrame):
 
         # Create Objects
         self.close_button = ctk.CTkButton(self, text="X", fg_color="red4", hover_color="firebrick3", width=10,
-                                          height=10, command=self.master.reload_apps)
+                                          height=10, command=lambda: self.master.close_app(self))
         self.app_title = ctk.CTkLabel(self, text="CIDR Calculator", font=("Courier", 20, "bold"))
         self.addressentry = ctk.CTkEntry(self, placeholder_text="10.0.0.0/8")
         self.calculate = ctk.CTkButton(self, text="Calculate", width=30, command=self.calculate_subnet)
+        self.tools = ctk.CTkFrame(self, fg_color="transparent")
+        self.batch_button = ctk.CTkButton(self.tools, text="Batch", width=80,
+                                          command=lambda: BatchSubnetWindow(self))
+        self.analyze_button = ctk.CTkButton(self.tools, text="Overlaps", width=80,
+                                            command=lambda: OverlapAnalysisWindow(self))
+        self.hosts_button = ctk.CTkButton(self.tools, text="List Hosts", width=80,
+                                          command=lambda: HostListWindow(self, self.addressentry.get().strip()))
+        self.summarize_button = ctk.CTkButton(self.tools, text="Summarize", width=80,
+                                              command=lambda: SummarizeWindow(self))
+        self.vlsm_button = ctk.CTkButton(self.tools, text="VLSM", width=80,
+                                         command=lambda: VlsmPlannerWindow(self, self.addressentry.get().strip()))
         self.net_label = ctk.CTkLabel(self, text="Network Address",
                                       font=("Arial", 15, "bold"), text_color="#3B8ED0")
         self.net_address = ctk.CTkLabel(self, text="")
@@ -737,6 +2635,12 @@ class App3Frame(ctk.CTkFrame):
         self.app_title.grid(row=1, column=1, columnspan=5, padx=PAD_X, pady=PAD_Y)
         self.addressentry.grid(row=2, column=3, padx=PAD_X, pady=PAD_Y)
         self.calculate.grid(row=3, column=3, padx=PAD_X, pady=PAD_Y)
+        self.tools.grid(row=4, column=3, padx=PAD_X, pady=PAD_Y)
+        self.batch_button.grid(row=0, column=0, padx=PAD_X)
+        self.analyze_button.grid(row=0, column=1, padx=PAD_X)
+        self.hosts_button.grid(row=0, column=2, padx=PAD_X)
+        self.summarize_button.grid(row=0, column=3, padx=PAD_X)
+        self.vlsm_button.grid(row=0, column=4, padx=PAD_X)
         self.net_label.grid(row=7, column=3, sticky="s")
         self.net_address.grid(row=8, column=3, pady=(0, 5))
         self.mask_label.grid(row=9, column=3)
@@ -750,43 +2654,19 @@ class App3Frame(ctk.CTkFrame):
         self.k = ctk.CTk
 
     def calculate_subnet(self):
-        ip_text = self.addressentry.get()
         try:
-            ip = ipaddress.ip_network(self.addressentry.get(), strict=False)
-            try:
-                self.net_address.configure(text=ip.network_address)
-                self.net_mask.configure(text=ip.netmask)
-                self.net_bcast.configure(text=ip.broadcast_address)
-                self.net_hosts.configure(text=ip.num_addresses - 2)
-                self.net_range.configure(text=f"{ip[1]} - {ip[-2]}")
-            except IndexError as e:
-                self.net_address.configure(text="")
-                self.net_mask.configure(text="")
-                self.net_bcast.configure(text="")
-                self.net_hosts.configure(text="")
-                self.net_range.configure(text="")
-                self.master.generate_popup("Raise Exception", "Invalid IP address or CIDR notation")
-            except ValueError as e:
-                self.net_address.configure(text="")
-                self.net_mask.configure(text="")
-                self.net_bcast.configure(text="")
-                self.net_hosts.configure(text="")
-                self.net_range.configure(text="")
-                self.master.generate_popup("Raise Exception", "Invalid IP address or CIDR notation")
-        except ValueError as e:
-            self.net_address.configure(text="")
-            self.net_mask.configure(text="")
-            self.net_bcast.configure(text="")
-            self.net_hosts.configure(text="")
-            self.net_range.configure(text="")
-            self.master.generate_popup("Raise Exception", "Invalid IP address or CIDR notation")
-        except IndexError as e:
-            self.net_address.configure(text="")
-            self.net_mask.configure(text="")
-            self.net_bcast.configure(text="")
-            self.net_hosts.configure(text="")
-            self.net_range.configure(text="")
+            version, network, length = parse_prefix(self.addressentry.get().strip())
+        except ValueError:
+            for label in (self.net_address, self.net_mask, self.net_bcast, self.net_hosts, self.net_range):
+                label.configure(text="")
             self.master.generate_popup("Raise Exception", "Invalid IP address or CIDR notation")
+            return
+        mask, broadcast, hosts, first, last = subnet_summary(version, network, length)
+        self.net_address.configure(text=format_address(version, network))
+        self.net_mask.configure(text=format_address(version, mask))
+        self.net_bcast.configure(text="N/A (IPv6)" if broadcast is None else format_address(version, broadcast))
+        self.net_hosts.configure(text=f"{hosts:,}")
+        self.net_range.configure(text=format_range(version, first, last))
 
     # def is_valid_ip(self, ip):
     #     try:
@@ -803,26 +2683,1155 @@ class App3Frame(ctk.CTkFrame):
     #         return False
 
 
+def parse_prefix(text):
+    """(version, network, prefix length) for a CIDR or bare address; host bits are cleared like strict=False.
+
+    Plain CIDRs are parsed with inet_pton, which is several times faster than building an ip_network;
+    anything else (netmask or hostmask notation) falls back to ipaddress."""
+    address, slash, length = text.partition("/")
+    family, bits = (socket.AF_INET6, 128) if ":" in address else (socket.AF_INET, 32)
+    try:
+        value = int.from_bytes(socket.inet_pton(family, address), "big")
+        # int() would also take "", " 8" or "+8"; leave anything but plain digits to ipaddress to judge
+        if slash and not (length.isascii() and length.isdigit()):
+            raise ValueError
+        prefix_length = int(length) if slash else bits
+        if not 0 <= prefix_length <= bits:
+            raise ValueError
+    except (OSError, ValueError):
+        network = ipaddress.ip_network(text, strict=False)  # Raises ValueError for anything invalid
+        return network.version, int(network.network_address), network.prefixlen
+    host_bits = bits - prefix_length
+    return 4 if bits == 32 else 6, value >> host_bits << host_bits, prefix_length
+
+
+def parse_prefixes(lines):
+    """Parses one prefix per line; anything after the first comma or whitespace is ignored.
+
+    Returns parallel (versions, networks, lengths, line numbers) lists and a list of (line number, text)
+    that did not parse."""
+    versions, networks, lengths, line_numbers, invalid = [], [], [], [], []
+    for line_number, line in enumerate(lines, start=1):
+        text = line.replace(",", " ").split(maxsplit=1)[0] if line.strip() else ""
+        if not text or text.startswith("#"):
+            continue
+        try:
+            version, network, length = parse_prefix(text)
+        except ValueError:
+            invalid.append((line_number, text))
+            continue
+        versions.append(version)
+        networks.append(network)
+        lengths.append(length)
+        line_numbers.append(line_number)
+    return versions, networks, lengths, line_numbers, invalid
+
+
+def format_address(version, value):
+    if version == 4:
+        return socket.inet_ntop(socket.AF_INET, value.to_bytes(4, "big"))
+    return socket.inet_ntop(socket.AF_INET6, value.to_bytes(16, "big"))
+
+
+def subnet_summary(version, network, length):
+    """(mask, broadcast, host count, first usable, last usable) as integers for one prefix.
+
+    IPv4 /31 and /32 count every address as usable (RFC 3021). IPv6 has no broadcast, so broadcast is
+    None and only the Subnet-Router anycast address is excluded, matching ip_network.hosts()."""
+    bits = 32 if version == 4 else 128
+    size = 1 << (bits - length)
+    last_address = network + size - 1
+    mask = ((1 << bits) - 1) ^ (size - 1)
+    if version == 4 and length < 31:
+        return mask, last_address, size - 2, network + 1, last_address - 1
+    if version == 6 and length < 127:
+        return mask, None, size - 1, network + 1, last_address
+    return mask, last_address if version == 4 else None, size, network, last_address
+
+
+def summarize_prefixes(versions, networks, lengths):
+    """subnet_summary() for every prefix, as five columns in input order.
+
+    IPv4 rows are computed in one vectorized pass when NumPy is installed. The arithmetic is done in
+    uint64 so a /0 (2**32 addresses) does not overflow; IPv6 needs 128 bits and always uses Python ints."""
+    columns = [[None] * len(versions) for _ in range(5)]
+    v4_rows = [index for index, version in enumerate(versions) if version == 4]
+    try:
+        np = numpy.load()
+    except ImportError:
+        np = None
+    if np is not None and v4_rows:
+        network = np.array([networks[index] for index in v4_rows], dtype=np.uint64)
+        length = np.array([lengths[index] for index in v4_rows], dtype=np.uint64)
+        size = np.left_shift(np.uint64(1), np.uint64(32) - length)
+        broadcast = network + size - np.uint64(1)
+        point_to_point = length >= 31
+        values = (
+            np.uint64(0xFFFFFFFF) ^ (size - np.uint64(1)),
+            broadcast,
+            np.where(point_to_point, size, size - np.uint64(2)),
+            np.where(point_to_point, network, network + np.uint64(1)),
+            np.where(point_to_point, broadcast, broadcast - np.uint64(1)),
+        )
+        for column, computed in zip(columns, values):
+            for index, value in zip(v4_rows, computed.tolist()):
+                column[index] = value
+        remaining = (index for index, version in enumerate(versions) if version != 4)
+    else:
+        remaining = range(len(versions))
+    for index in remaining:
+        for column, value in zip(columns, subnet_summary(versions[index], networks[index], lengths[index])):
+            column[index] = value
+    return columns
+
+
+def range_to_prefixes(version, first, last):
+    """The fewest CIDR blocks covering first..last, as (network, prefix length) pairs."""
+    bits = 32 if version == 4 else 128
+    prefixes = []
+    while first <= last:
+        # Largest block aligned at `first` that does not run past `last`
+        size = first & -first if first else 1 << bits
+        while size > last - first + 1:
+            size >>= 1
+        prefixes.append((first, bits - size.bit_length() + 1))
+        first += size
+    return prefixes
+
+
+def iter_hosts(version, network, length, offset=0):
+    """Usable addresses of a prefix from `offset` on, generated one at a time so a /8 or an IPv6 /64
+    costs no more memory than a /30."""
+    _, _, count, first, _ = subnet_summary(version, network, length)
+    for address in range(first + offset, first + count):
+        yield format_address(version, address)
+
+
+def collapse_prefixes(versions, networks, lengths):
+    """The minimal set of prefixes covering exactly the same addresses, like ipaddress.collapse_addresses.
+
+    Prefixes become integer intervals, are sorted once, and overlapping or adjacent intervals are
+    merged in a single pass; each merged run is then split back into CIDR blocks. Returns sorted
+    (version, network, prefix length) tuples."""
+    intervals = sorted((version, network, network + (1 << ((32 if version == 4 else 128) - length)) - 1)
+                       for version, network, length in zip(versions, networks, lengths))
+    collapsed = []
+    run = None  # [version, first, last] being extended
+
+    def flush():
+        collapsed.extend((run[0], network, length) for network, length in range_to_prefixes(*run))
+
+    for version, first, last in intervals:
+        if run and run[0] == version and first <= run[2] + 1:
+            run[2] = max(run[2], last)
+            continue
+        if run:
+            flush()
+        run = [version, first, last]
+    if run:
+        flush()
+    return collapsed
+
+
+def required_prefix_length(version, hosts):
+    """Longest prefix whose usable host count, as subnet_summary() counts it, is at least `hosts`."""
+    bits = 32 if version == 4 else 128
+    if version == 4:
+        return bits - (0 if hosts <= 1 else 1 if hosts == 2 else (hosts + 1).bit_length())
+    return bits - (0 if hosts <= 1 else 1 if hosts == 2 else hosts.bit_length())
+
+
+def plan_vlsm(version, network, length, requirements):
+    """Carves the block network/length into subnets sized for `requirements`, a list of (name, hosts).
+
+    Subnets are placed largest first from the start of the block, which keeps every one of them
+    aligned without searching for space. Returns one (name, hosts, subnet length, subnet network)
+    row per requirement in placement order, with None as the network when it no longer fits, and
+    the (first, last) range left free at the end of the block, or None. Raises ValueError for a host
+    count below 1."""
+    for name, hosts in requirements:
+        if hosts < 1:
+            raise ValueError(f"{name}: host count must be at least 1, got {hosts}")
+    bits = 32 if version == 4 else 128
+    block_end = network + (1 << (bits - length)) - 1
+    cursor = network
+    plan = []
+    sized = sorted(((required_prefix_length(version, hosts), position, name, hosts)
+                    for position, (name, hosts) in enumerate(requirements)))
+    for subnet_length, _, name, hosts in sized:
+        size = 1 << (bits - subnet_length)
+        if subnet_length < length or cursor + size - 1 > block_end:
+            plan.append((name, hosts, subnet_length, None))
+            continue
+        plan.append((name, hosts, subnet_length, cursor))
+        cursor += size
+    return plan, (cursor, block_end) if cursor <= block_end else None
+
+
+def format_range(version, first, last):
+    return f"{format_address(version, first)} - {format_address(version, last)}"
+
+
+def analyze_prefixes(versions, networks, lengths, line_numbers):
+    """Duplicates, containment and free gaps in a prefix list with one sort and one stack sweep.
+
+    Two CIDR blocks either nest or are disjoint, so every overlap is a duplicate or a containment.
+    Prefixes are sorted by start address with wider blocks first; a stack holds the chain of blocks
+    enclosing the current one, so each prefix is pushed and popped once and the whole pass is
+    O(n log n). Gaps are reported between top-level blocks and inside any block that has children.
+
+    Returns findings as (kind, version, start, end, chain) tuples, where `chain` holds the indices of
+    the enclosing prefixes from the outermost in, with the prefix itself last (empty for gaps)."""
+    bits = [32 if version == 4 else 128 for version in versions]
+    order = sorted(range(len(versions)),
+                   key=lambda index: (versions[index], networks[index], lengths[index], line_numbers[index]))
+    findings = []
+    stack = []  # [index, end, next address not covered by a child, has children]
+    previous_root = None  # (version, end) of the last top-level block
+
+    def close(entry):
+        index, end, cursor, has_children = entry
+        if has_children and cursor <= end:
+            findings.append(("Gap", versions[index], cursor, end, ()))
+
+    for index in order:
+        version, start = versions[index], networks[index]
+        end = start + (1 << (bits[index] - lengths[index])) - 1
+        while stack and (versions[stack[-1][0]] != version or stack[-1][1] < start):
+            close(stack.pop())
+        chain = tuple(entry[0] for entry in stack) + (index,)
+        if stack:
+            parent = stack[-1]
+            if networks[parent[0]] == start and parent[1] == end:
+                findings.append(("Duplicate", version, start, end, chain))
+                continue
+            findings.append(("Contained", version, start, end, chain))
+            if start > parent[2]:
+                findings.append(("Gap", version, parent[2], start - 1, ()))
+            parent[2] = end + 1
+            parent[3] = True
+        else:
+            if previous_root and previous_root[0] == version and start > previous_root[1] + 1:
+                findings.append(("Gap", version, previous_root[1] + 1, start - 1, ()))
+            previous_root = (version, end)
+        stack.append([index, end, start, False])
+    while stack:
+        close(stack.pop())
+    findings.sort(key=lambda finding: (finding[1], finding[2]))  # Gaps are found out of address order
+    return findings
+
+
+class PrefixToolWindow(ctk.CTkToplevel, metaclass=abc.ABCMeta):
+    """Popup shared by App3Frame's prefix tools: a pasted or imported prefix list in, a paged table out.
+
+    Subclasses set `columns` and implement compute(lines, options), which runs on a worker thread and
+    returns (row count, function returning row i, status text); `options` comes from read_options() on
+    the Tk thread. Only one page of rows is formatted and inserted into the Treeview at a time, so
+    results of any size display immediately."""
+    tool_title = "Prefix Tool"
+    columns = ()
+    action_text = "Calculate"
+    page_size = PREFIX_PAGE_SIZE
+
+    def __init__(self, master):
+        super().__init__(master)
+        self.input_path = None
+        self.row_count = 0
+        self.get_row = None
+        self.page = 0
+        self.result = None  # Set by the worker thread, picked up by poll_result()
+        self.poll_id = None
+
+        # Popup UI
+        self.title(self.tool_title)
+        self.geometry("900x600")
+        self.rowconfigure(3, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        # Create Objects
+        self.input_text = ctk.CTkTextbox(self, height=110)
+        self.input_text.bind("<Key>", lambda event: self.set_input_path(None))
+        self.options = ctk.CTkFrame(self, fg_color="transparent")  # Tool-specific inputs
+        self.buttons = ctk.CTkFrame(self, fg_color="transparent")
+        self.import_button = ctk.CTkButton(self.buttons, text="Import File", width=100, command=self.import_file)
+        self.run_button = ctk.CTkButton(self.buttons, text=self.action_text, width=100, command=self.run)
+        self.export_button = ctk.CTkButton(self.buttons, text="Export CSV", width=100, command=self.export,
+                                           state="disabled")
+        self.status = ctk.CTkLabel(self.buttons, text="One prefix per line")
+        self.table_frame = ctk.CTkFrame(self)
+        self.table = ttk.Treeview(self.table_frame, columns=self.columns, show="headings")
+        for column in self.columns:
+            self.table.heading(column, text=column)
+            self.table.column(column, width=110, stretch=True)
+        self.scrollbar = ttk.Scrollbar(self.table_frame, orient="vertical", command=self.table.yview)
+        self.table.configure(yscrollcommand=self.scrollbar.set)
+        self.pager = ctk.CTkFrame(self, fg_color="transparent")
+        self.prev_button = ctk.CTkButton(self.pager, text="<", width=40, command=lambda: self.show_page(self.page - 1))
+        self.page_label = ctk.CTkLabel(self.pager, text="")
+        self.next_button = ctk.CTkButton(self.pager, text=">", width=40, command=lambda: self.show_page(self.page + 1))
+
+        # Place Objects
+        self.input_text.grid(row=0, column=0, padx=PAD_X, pady=PAD_Y, sticky="ew")
+        self.options.grid(row=1, column=0, padx=PAD_X, sticky="ew")
+        self.buttons.grid(row=2, column=0, padx=PAD_X, sticky="ew")
+        self.import_button.grid(row=0, column=0, padx=PAD_X, pady=PAD_Y)
+        self.run_button.grid(row=0, column=1, padx=PAD_X, pady=PAD_Y)
+        self.export_button.grid(row=0, column=2, padx=PAD_X, pady=PAD_Y)
+        self.status.grid(row=0, column=3, padx=PAD_X, pady=PAD_Y, sticky="w")
+        self.table_frame.grid(row=3, column=0, padx=PAD_X, pady=PAD_Y, sticky="nsew")
+        self.table_frame.rowconfigure(0, weight=1)
+        self.table_frame.columnconfigure(0, weight=1)
+        self.table.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.pager.grid(row=4, column=0, padx=PAD_X, pady=PAD_Y)
+        self.prev_button.grid(row=0, column=0, padx=PAD_X)
+        self.page_label.grid(row=0, column=1, padx=PAD_X)
+        self.next_button.grid(row=0, column=2, padx=PAD_X)
+
+    def set_input_path(self, file_path):
+        self.input_path = file_path
+        if file_path:
+            self.status.configure(text=f"Using {os.path.basename(file_path)}", text_color=("gray10", "gray90"))
+
+    def import_file(self):
+        file_path = filedialog.askopenfilename(parent=self, filetypes=[("Prefix lists", "*.txt *.csv"),
+                                                                       ("All files", "*")])
+        if file_path:
+            self.set_input_path(file_path)
+
+    def read_options(self):
+        """Values of the tool-specific widgets, read on the Tk thread before compute() starts."""
+        return None
+
+    @abc.abstractmethod
+    def compute(self, lines, options):
+        """Runs on a worker thread; returns (row count, function returning row i, status text)."""
+
+    def run(self):
+        text = None if self.input_path else self.input_text.get("1.0", ctk.END)
+        options = self.read_options()
+        self.run_button.configure(state="disabled")
+        self.status.configure(text="Working...", text_color=("gray10", "gray90"))
+        threading.Thread(target=self.compute_task, args=(self.input_path, text, options), daemon=True).start()
+        self.poll_id = self.after(PROGRESS_INTERVAL_MS, self.poll_result)
+
+    def compute_task(self, input_path, text, options):
+        start = time.perf_counter()
+        try:
+            if input_path:
+                with open(input_path, encoding="utf-8-sig") as file:
+                    text = file.read()
+            row_count, get_row, status = self.compute(text.splitlines(), options)
+            self.result = (row_count, get_row, f"{status} in {time.perf_counter() - start:.2f}s", None)
+        except Exception as e:
+            # Anything compute() raises is reported in the status line, never left on "Working..."
+            if not isinstance(e, (OSError, ValueError)):
+                logging.critical(f"{self.tool_title} failed: {e!r}")
+            self.result = (0, None, str(e) or type(e).__name__, e)
+
+    def poll_result(self):
+        if self.result is None:
+            self.poll_id = self.after(PROGRESS_INTERVAL_MS, self.poll_result)
+            return
+        self.poll_id = None
+        self.row_count, self.get_row, status, error = self.result
+        self.result = None
+        self.run_button.configure(state="normal")
+        self.export_button.configure(state="normal" if self.row_count else "disabled")
+        self.status.configure(text=status, text_color="firebrick1" if error else "green")
+        self.show_page(self.first_page())
+
+    def destroy(self):
+        if self.poll_id is not None:
+            self.after_cancel(self.poll_id)
+        super().destroy()
+
+    def first_page(self):
+        return 0
+
+    def show_page(self, page):
+        pages = max(1, -(-self.row_count // self.page_size))
+        self.page = min(max(page, 0), pages - 1)
+        self.table.delete(*self.table.get_children())
+        start = self.page * self.page_size
+        for index in range(start, min(start + self.page_size, self.row_count)):
+            self.table.insert("", ctk.END, values=self.get_row(index))
+        self.page_label.configure(text=f"Page {self.page + 1} of {pages} ({self.row_count} rows)")
+
+    def export(self):
+        file_path = filedialog.asksaveasfilename(parent=self, defaultextension=".csv", filetypes=[("CSV", "*.csv")])
+        if not file_path:
+            return
+        try:
+            with open(file_path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(self.columns)
+                writer.writerows(self.get_row(index) for index in range(self.row_count))
+        except OSError as e:
+            self.status.configure(text=f"Export failed: {e}", text_color="firebrick1")
+            return
+        self.status.configure(text=f"Exported {self.row_count} rows to {os.path.basename(file_path)}",
+                              text_color="green")
+
+
+class BatchSubnetWindow(PrefixToolWindow):
+    """Network, mask, broadcast, host count and usable range for a whole list of prefixes."""
+    tool_title = "Batch Subnet Calculation"
+    columns = ("Prefix", "Network", "Mask", "Broadcast", "Host Count", "First Usable", "Last Usable")
+
+    def compute(self, lines, options):
+        versions, networks, lengths, _, invalid = parse_prefixes(lines)
+        masks, broadcasts, hosts, firsts, lasts = summarize_prefixes(versions, networks, lengths)
+
+        def get_row(index):
+            version = versions[index]
+            network = format_address(version, networks[index])
+            broadcast = "N/A (IPv6)" if broadcasts[index] is None else format_address(version, broadcasts[index])
+            return (f"{network}/{lengths[index]}", network, format_address(version, masks[index]), broadcast,
+                    hosts[index], format_address(version, firsts[index]), format_address(version, lasts[index]))
+
+        status = f"{len(versions)} prefixes"
+        if invalid:
+            status += f", {len(invalid)} invalid (first on line {invalid[0][0]}: {invalid[0][1]})"
+        return len(versions), get_row, status
+
+
+class OverlapAnalysisWindow(PrefixToolWindow):
+    """Duplicates, supernet/subnet chains and free gaps across a prefix list, e.g. a routing table or IPAM export."""
+    tool_title = "Overlap Analysis"
+    columns = ("Finding", "Prefix", "Lines", "Enclosed By", "Detail")
+    action_text = "Analyze"
+    kinds = {"All findings": None, "Duplicates": "Duplicate", "Containment": "Contained", "Gaps": "Gap"}
+
+    def __init__(self, master):
+        super().__init__(master)
+
+        # Create Objects
+        self.kind = ctk.CTkOptionMenu(self.options, values=list(self.kinds))
+
+        # Place Objects
+        self.kind.grid(row=0, column=0, padx=PAD_X, pady=PAD_Y)
+
+    def read_options(self):
+        return self.kinds[self.kind.get()]
+
+    def compute(self, lines, options):
+        versions, networks, lengths, line_numbers, invalid = parse_prefixes(lines)
+        findings = analyze_prefixes(versions, networks, lengths, line_numbers)
+        counts = {kind: 0 for kind in self.kinds.values() if kind}
+        for finding in findings:
+            counts[finding[0]] += 1
+        if options:
+            findings = [finding for finding in findings if finding[0] == options]
+
+        def prefix_text(index):
+            return f"{format_address(versions[index], networks[index])}/{lengths[index]}"
+
+        def get_row(row):
+            kind, version, start, end, chain = findings[row]
+            if kind == "Gap":
+                blocks = range_to_prefixes(version, start, end)
+                detail = ", ".join(f"{format_address(version, network)}/{length}" for network, length in blocks[:4])
+                if len(blocks) > 4:
+                    detail += f" (+{len(blocks) - 4} more)"
+                return kind, format_range(version, start, end), "", "", f"{end - start + 1} free: {detail}"
+            index = chain[-1]
+            enclosing = " > ".join(prefix_text(parent) for parent in chain[:-1])
+            if kind == "Duplicate":
+                return kind, prefix_text(index), f"{line_numbers[chain[-2]]}, {line_numbers[index]}", "", \
+                    "Listed more than once"
+            return kind, prefix_text(index), line_numbers[index], enclosing, f"Depth {len(chain) - 1}"
+
+        status = (f"{len(versions)} prefixes: {counts['Duplicate']} duplicates, {counts['Contained']} contained, "
+                  f"{counts['Gap']} gaps")
+        if invalid:
+            status += f", {len(invalid)} invalid"
+        return len(findings), get_row, status
+
+
+class HostListWindow(PrefixToolWindow):
+    """Pages through every usable address of one prefix, with a jump to any offset and range export.
+
+    Rows are computed from their offset, so opening a /8 or an IPv6 /64 is as quick as a /24."""
+    tool_title = "Host List"
+    columns = ("Offset", "Address")
+    action_text = "List Hosts"
+
+    def __init__(self, master, prefix=""):
+        super().__init__(master)
+        self.network = None  # (version, network, length) being listed
+
+        # Create Objects
+        self.prefix = ctk.CTkEntry(self.options, placeholder_text="10.0.0.0/8")
+        self.offset = ctk.CTkEntry(self.options, placeholder_text="Offset (0)", width=120)
+        self.jump_button = ctk.CTkButton(self.options, text="Jump", width=60, command=self.jump)
+        self.export_count = ctk.CTkEntry(self.options, placeholder_text=f"Export count ({HOST_EXPORT_COUNT})",
+                                         width=160)
+
+        # Place Objects
+        self.input_text.grid_remove()
+        self.import_button.grid_remove()
+        self.prefix.grid(row=0, column=0, padx=PAD_X, pady=PAD_Y)
+        self.offset.grid(row=0, column=1, padx=PAD_X, pady=PAD_Y)
+        self.jump_button.grid(row=0, column=2, padx=PAD_X, pady=PAD_Y)
+        self.export_count.grid(row=0, column=3, padx=PAD_X, pady=PAD_Y)
+        self.status.configure(text="Enter a prefix")
+        if prefix:
+            self.prefix.insert(0, prefix)
+            self.run()
+
+    def read_options(self):
+        return self.prefix.get().strip()
+
+    def read_offset(self):
+        try:
+            return max(0, int(self.offset.get().replace(",", "") or 0))
+        except ValueError:
+            self.status.configure(text="Offset must be a whole number", text_color="firebrick1")
+            return None
+
+    def compute(self, lines, options):
+        version, network, length = parse_prefix(options)
+        _, _, count, first, last = subnet_summary(version, network, length)
+        self.network = (version, network, length)
+
+        def get_row(index):
+            return f"{index:,}", format_address(version, first + index)
+
+        return count, get_row, f"{count:,} usable addresses, {format_range(version, first, last)}"
+
+    def first_page(self):
+        offset = self.read_offset() or 0
+        return min(offset, max(self.row_count - 1, 0)) // self.page_size
+
+    def jump(self):
+        if self.network is not None and self.read_offset() is not None:
+            self.show_page(self.first_page())
+
+    def export(self):
+        """Writes `export count` addresses starting at the offset, streamed from iter_hosts()."""
+        offset = self.read_offset()
+        try:
+            count = int(self.export_count.get().replace(",", "") or HOST_EXPORT_COUNT)
+        except ValueError:
+            count = -1
+        if offset is None or count < 1:
+            self.status.configure(text="Offset and export count must be whole numbers", text_color="firebrick1")
+            return
+        file_path = filedialog.asksaveasfilename(parent=self, defaultextension=".csv", filetypes=[("CSV", "*.csv")])
+        if not file_path:
+            return
+        version, network, length = self.network
+        rows = 0
+        try:
+            with open(file_path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(self.columns)
+                for index, address in enumerate(itertools.islice(iter_hosts(version, network, length, offset), count),
+                                                start=offset):
+                    writer.writerow((index, address))
+                    rows += 1
+        except OSError as e:
+            self.status.configure(text=f"Export failed: {e}", text_color="firebrick1")
+            return
+        self.status.configure(text=f"Exported {rows:,} addresses to {os.path.basename(file_path)}", text_color="green")
+
+
+class SummarizeWindow(PrefixToolWindow):
+    """Collapses a prefix list into the fewest prefixes covering exactly the same addresses."""
+    tool_title = "Route Summarization"
+    columns = ("Prefix", "First", "Last", "Addresses")
+    action_text = "Summarize"
+
+    def compute(self, lines, options):
+        versions, networks, lengths, _, invalid = parse_prefixes(lines)
+        collapsed = collapse_prefixes(versions, networks, lengths)
+
+        def get_row(index):
+            version, network, length = collapsed[index]
+            size = 1 << ((32 if version == 4 else 128) - length)
+            return (f"{format_address(version, network)}/{length}", format_address(version, network),
+                    format_address(version, network + size - 1), f"{size:,}")
+
+        status = f"{len(versions)} prefixes summarized to {len(collapsed)}"
+        if invalid:
+            status += f", {len(invalid)} invalid"
+        return len(collapsed), get_row, status
+
+
+class VlsmPlannerWindow(PrefixToolWindow):
+    """Plans subnets inside a parent block for a list of host-count requirements, one "name,hosts" per line."""
+    tool_title = "VLSM Planner"
+    columns = ("Name", "Hosts Needed", "Subnet", "Usable Hosts", "First Usable", "Last Usable", "Broadcast")
+    action_text = "Plan"
+
+    def __init__(self, master, parent=""):
+        super().__init__(master)
+
+        # Create Objects
+        self.parent_block = ctk.CTkEntry(self.options, placeholder_text="Parent block, e.g. 10.0.0.0/16")
+
+        # Place Objects
+        self.parent_block.grid(row=0, column=0, padx=PAD_X, pady=PAD_Y)
+        self.status.configure(text="One requirement per line: name,hosts")
+        if parent:
+            self.parent_block.insert(0, parent)
+
+    def read_options(self):
+        return self.parent_block.get().strip()
+
+    def compute(self, lines, options):
+        version, network, length = parse_prefix(options)
+        requirements = []
+        for line_number, line in enumerate(lines, start=1):
+            fields = [field.strip() for field in line.split(",")]
+            if not fields[0] or fields[0].startswith("#"):
+                continue
+            name, hosts = (f"Subnet {line_number}", fields[0]) if len(fields) == 1 else fields[:2]
+            try:
+                requirements.append((name, int(hosts)))
+            except ValueError:
+                raise ValueError(f"Line {line_number}: host count must be a whole number") from None
+        plan, free = plan_vlsm(version, network, length, requirements)
+
+        def get_row(index):
+            if index == len(plan):
+                return "(free)", "", format_range(version, *free), f"{free[1] - free[0] + 1:,} addresses", "", "", ""
+            name, hosts, subnet_length, subnet = plan[index]
+            if subnet is None:
+                return name, hosts, f"Does not fit (/{subnet_length})", "", "", "", ""
+            _, broadcast, usable, first, last = subnet_summary(version, subnet, subnet_length)
+            return (name, hosts, f"{format_address(version, subnet)}/{subnet_length}", f"{usable:,}",
+                    format_address(version, first), format_address(version, last),
+                    "N/A (IPv6)" if broadcast is None else format_address(version, broadcast))
+
+        unplaced = sum(1 for row in plan if row[3] is None)
+        status = f"{len(plan) - unplaced} of {len(plan)} subnets placed"
+        return len(plan) + (free is not None), get_row, status
+
+
 class App4Frame(ctk.CTkFrame):
     def __init__(self, master):
         super().__init__(master)
 
         # App Configuration/Variables
+        self.capture = None
+        self.previous = None  # (monotonic time, packets, bytes) at the last refresh
+        self.refresh_id = None
+        if hasattr(socket, "AF_PACKET"):
+            interfaces = ["any"] + sorted(name for _, name in socket.if_nameindex())
+        else:
+            interfaces = ["Live capture needs Linux"]
 
         # Grid Config
-        self.rowconfigure(3, weight=1)
+        self.rowconfigure(9, weight=1)
         self.columnconfigure([0, 10], weight=1)
 
         # Create Objects
         self.close_button = ctk.CTkButton(self, text="X", fg_color="red4", hover_color="firebrick3", width=10,
-                                          height=10, command=self.master.reload_apps)
-        self.placeholder = ctk.CTkLabel(self, text="Coming Soon...")
+                                          height=10, command=lambda: self.master.close_app(self))
+        self.app_title = ctk.CTkLabel(self, text="Packet Capture", font=("Courier", 20, "bold"))
+        self.interface = ctk.CTkOptionMenu(self, values=interfaces)
+        self.live_button = ctk.CTkButton(self, text="Start Live", width=100, command=self.start_live)
+        self.file_button = ctk.CTkButton(self, text="Open pcap", width=100, command=self.start_file)
+        self.stop_button = ctk.CTkButton(self, text="Stop", width=100, fg_color="firebrick3",
+                                         hover_color="firebrick4", state="disabled", command=self.stop)
+        self.source_label = ctk.CTkLabel(self, text="Not capturing")
+        self.rate_label = ctk.CTkLabel(self, text="", font=("Arial", 15, "bold"), text_color="#3B8ED0")
+        self.total_label = ctk.CTkLabel(self, text="")
+        self.protocol_label = ctk.CTkLabel(self, text="")
+        self.drop_label = ctk.CTkLabel(self, text="")
+        self.talkers = ttk.Treeview(self, columns=("Source", "Packets", "Bytes"), show="headings",
+                                    height=CAPTURE_TOP_TALKERS)
+        for column in ("Source", "Packets", "Bytes"):
+            self.talkers.heading(column, text=column)
+            self.talkers.column(column, width=160 if column == "Source" else 100, stretch=True)
 
         # Place Objects
         self.close_button.grid(row=0, column=11, padx=PAD_X, pady=PAD_Y, sticky="e")
-        self.placeholder.grid(row=3, column=1, padx=PAD_X, pady=PAD_Y)
+        self.app_title.grid(row=1, column=1, columnspan=4, padx=PAD_X, pady=PAD_Y)
+        self.interface.grid(row=2, column=1, padx=PAD_X, pady=PAD_Y)
+        self.live_button.grid(row=2, column=2, padx=PAD_X, pady=PAD_Y)
+        self.file_button.grid(row=2, column=3, padx=PAD_X, pady=PAD_Y)
+        self.stop_button.grid(row=2, column=4, padx=PAD_X, pady=PAD_Y)
+        self.source_label.grid(row=3, column=1, columnspan=4, padx=PAD_X, pady=PAD_Y)
+        self.rate_label.grid(row=4, column=1, columnspan=4, padx=PAD_X, pady=PAD_Y)
+        self.total_label.grid(row=5, column=1, columnspan=4, padx=PAD_X)
+        self.protocol_label.grid(row=6, column=1, columnspan=4, padx=PAD_X)
+        self.drop_label.grid(row=7, column=1, columnspan=4, padx=PAD_X)
+        self.talkers.grid(row=8, column=1, columnspan=4, padx=PAD_X, pady=PAD_Y, sticky="ew")
+
+    def destroy(self):
+        # Stop the capture threads along with the widgets so a closed applet does not keep capturing
+        if self.capture is not None:
+            self.capture.stop()
+        if self.refresh_id is not None:
+            self.after_cancel(self.refresh_id)
+        super().destroy()
+
+    def start_live(self):
+        interface = self.interface.get()
+        try:
+            self.start(PacketCapture.live(interface), f"Capturing on {interface}")
+        except PermissionError:
+            self.master.generate_popup("Error", "Live capture needs root or the CAP_NET_RAW capability.")
+        except (AttributeError, OSError) as e:
+            self.master.generate_popup("Error", f"Unable to capture on {interface}: {e}")
+
+    def start_file(self):
+        file_path = filedialog.askopenfilename(filetypes=[("pcap", "*.pcap *.cap"), ("All files", "*")])
+        if not file_path:
+            return
+        try:
+            self.start(PacketCapture.from_file(file_path), f"Reading {os.path.basename(file_path)}")
+        except (OSError, ValueError) as e:
+            self.master.generate_popup("Error", f"Unable to read {os.path.basename(file_path)}: {e}")
+
+    def start(self, capture, description):
+        if self.capture is not None:
+            self.capture.stop()
+        self.capture = capture
+        self.previous = (time.monotonic(), 0, 0)
+        self.source_label.configure(text=description)
+        self.live_button.configure(state="disabled")
+        self.file_button.configure(state="disabled")
+        self.stop_button.configure(state="normal")
+        capture.start()
+        logging.warning(f"Packet capture started: {description}")
+        if self.refresh_id is None:
+            self.refresh_id = self.after(CAPTURE_REFRESH_MS, self.refresh)
+
+    def stop(self):
+        if self.capture is not None:
+            self.capture.stop()
+
+    def refresh(self):
+        """Redraws the counters from one snapshot, so UI cost is fixed no matter the packet rate."""
+        stats = self.capture.snapshot()
+        now = time.monotonic()
+        elapsed = max(now - self.previous[0], 1e-6)
+        pps = (stats["packets"] - self.previous[1]) / elapsed
+        bps = (stats["bytes"] - self.previous[2]) * 8 / elapsed
+        self.previous = (now, stats["packets"], stats["bytes"])
+        self.rate_label.configure(text=f"{pps:,.0f} pps   {bps / 1e6:,.2f} Mbps")
+        self.total_label.configure(text=f'{stats["packets"]:,} packets   {stats["bytes"]:,} bytes')
+        self.protocol_label.configure(text="   ".join(f"{name} {count:,}" for name, count in stats["protocols"]))
+        self.drop_label.configure(text=f'Kernel drops {stats["kernel_drops"]:,}   '
+                                       f'Ring overruns {stats["overruns"]:,}')
+        rows = self.talkers.get_children()
+        for position, (source, packets, size) in enumerate(stats["talkers"]):
+            if position < len(rows):
+                self.talkers.item(rows[position], values=(source, f"{packets:,}", f"{size:,}"))
+            else:
+                self.talkers.insert("", ctk.END, values=(source, f"{packets:,}", f"{size:,}"))
+        self.talkers.delete(*rows[len(stats["talkers"]):])
+        if stats["finished"]:
+            self.refresh_id = None
+            self.source_label.configure(text=self.source_label.cget("text") + " (stopped)")
+            self.live_button.configure(state="normal")
+            self.file_button.configure(state="normal")
+            self.stop_button.configure(state="disabled")
+            logging.warning(f'Packet capture stopped after {stats["packets"]} packets, '
+                            f'{stats["kernel_drops"]} kernel drops, {stats["overruns"]} ring overruns.')
+            return
+        self.refresh_id = self.after(CAPTURE_REFRESH_MS, self.refresh)
+
+
+class CaptureRing:
+    """Fixed-size frame slots written by the capture thread and read in batches by the aggregator.
+
+    All memory is allocated up front: one bytearray cut into `slots` views of `snaplen` bytes, plus
+    arrays of bytes kept and original length per slot. The capture thread only advances `written` and
+    the aggregator only advances `read`; a live capture never waits for the aggregator, so frames it
+    laps before they are counted are reported as overruns rather than blocking capture."""
+
+    def __init__(self, slots=CAPTURE_RING_SLOTS, snaplen=CAPTURE_SNAPLEN):
+        self.slots = slots
+        self.snaplen = snaplen
+        self.buffer = bytearray(slots * snaplen)
+        self.view = memoryview(self.buffer)
+        self.frames = [self.view[slot * snaplen:(slot + 1) * snaplen] for slot in range(slots)]
+        self.captured = array.array("I", bytes(4 * slots))
+        self.lengths = array.array("I", bytes(4 * slots))
+        self.written = 0
+        self.read = 0
+
+
+class PacketCapture:
+    """Captures from an AF_PACKET socket or a pcap file into a CaptureRing and aggregates the frames.
+
+    Two threads run per capture. The capture thread does nothing but recv_into/readinto the next ring
+    slot, so it returns to the kernel as fast as possible; the aggregator parses headers from the ring
+    in batches and keeps packet, byte, protocol and per-source counters. snapshot() is all the UI reads.
+    Rates for a pcap file reflect how fast it is read, not the original capture timing."""
+    ETHERNET, RAW_IP, LINUX_SLL = 1, 101, 113  # pcap link types
+    PCAP_MAGIC = {b"\xd4\xc3\xb2\xa1": "<", b"\xa1\xb2\xc3\xd4": ">",  # microsecond timestamps
+                  b"\x4d\x3c\xb2\xa1": "<", b"\xa1\xb2\x3c\x4d": ">"}  # nanosecond timestamps
+    PROTOCOLS = {6: "TCP", 17: "UDP", 1: "ICMP", 58: "ICMPv6"}
+
+    def __init__(self, source, link_type, record=None):
+        self.source = source  # Non-blocking AF_PACKET socket, or a pcap file positioned after its header
+        self.link_type = link_type
+        self.record = record  # struct.Struct of a pcap record header; None for live captures
+        self.ring = CaptureRing()
+        self.stopping = threading.Event()
+        self.source_done = False
+        self.finished = False
+        self.lock = threading.Lock()
+        self.packets = 0
+        self.bytes = 0
+        self.overruns = 0
+        self.kernel_drops = 0
+        self.protocols = {}
+        self.talkers = {}  # Source address (int for IPv4, (high, low) 64-bit halves for IPv6) -> [packets, bytes]
+        # Aggregator's private copy of the chunk being counted, so the capture thread cannot change it mid-count
+        self.chunk = CaptureRing(min(CAPTURE_CHUNK, self.ring.slots), self.ring.snaplen)
+        self.threads = [threading.Thread(target=self.capture, daemon=True, name="capture"),
+                        threading.Thread(target=self.aggregate, daemon=True, name="capture-aggregator")]
+
+    @classmethod
+    def live(cls, interface="any"):
+        sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(ETH_P_ALL))
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, CAPTURE_SOCKET_BUFFER)
+            if interface != "any":
+                sock.bind((interface, 0))
+            sock.setblocking(False)
+        except OSError:
+            sock.close()
+            raise
+        return cls(sock, cls.ETHERNET)
+
+    @classmethod
+    def from_file(cls, file_path):
+        file = open(file_path, "rb")
+        try:
+            header = file.read(24)
+            if header[:4] == b"\x0a\x0d\x0d\x0a":
+                raise ValueError("pcapng files are not supported, save the capture as pcap")
+            if len(header) < 24 or header[:4] not in cls.PCAP_MAGIC:
+                raise ValueError("not a pcap file")
+            endian = cls.PCAP_MAGIC[header[:4]]
+            link_type = struct.unpack_from(endian + "I", header, 20)[0]
+        except (OSError, ValueError):
+            file.close()
+            raise
+        return cls(file, link_type, struct.Struct(endian + "IIII"))
+
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self):
+        self.stopping.set()
+
+    def capture(self):
+        try:
+            if self.record is None:
+                self.read_socket()
+            else:
+                self.read_file()
+        except (OSError, ValueError) as e:
+            logging.critical(f"Packet capture failed: {e}")
+        finally:
+            self.source_done = True
+            self.source.close()
+
+    def read_socket(self):
+        ring, sock, stopping = self.ring, self.source, self.stopping
+        frames, captured, lengths, slots, snaplen = ring.frames, ring.captured, ring.lengths, ring.slots, ring.snaplen
+        recv_into = sock.recv_into
+        while not stopping.is_set():
+            slot = ring.written % slots
+            try:
+                # MSG_TRUNC makes the kernel report the full frame length even though only snaplen is copied
+                length = recv_into(frames[slot], snaplen, socket.MSG_TRUNC)
+            except BlockingIOError:
+                select.select([sock], [], [], 0.2)
+                continue
+            captured[slot] = length if length < snaplen else snaplen
+            lengths[slot] = length
+            ring.written += 1
+
+    def read_file(self):
+        ring, file, record, stopping = self.ring, self.source, self.record, self.stopping
+        frames, captured, lengths, slots, snaplen = ring.frames, ring.captured, ring.lengths, ring.slots, ring.snaplen
+        header = bytearray(record.size)
+        unpack_from, readinto, seek = record.unpack_from, file.readinto, file.seek
+        while not stopping.is_set():
+            if readinto(header) < record.size:
+                break
+            _, _, included, length = unpack_from(header)
+            slot = ring.written % slots
+            # Fill the whole slot and seek back to the next record, rather than slicing a view per packet;
+            # the seek stays inside the file's read buffer
+            size = readinto(frames[slot])
+            seek(included - size, 1)
+            captured[slot] = included if included < size else size
+            lengths[slot] = length
+            # Let the aggregator catch up instead of overwriting frames it has not read; a file can wait
+            while ring.written - ring.read >= slots and not stopping.is_set():
+                time.sleep(0.001)
+            ring.written += 1
+
+    def aggregate(self):
+        ring = self.ring
+        while True:
+            written = ring.written
+            if written == ring.read:
+                if self.source_done and written == ring.written:
+                    break
+                time.sleep(0.01)
+                continue
+            # Bounded chunks keep the lock short and publish `read` often, so a file capture resumes sooner;
+            # a chunk never wraps past the end of the ring so it can be copied in one piece
+            end = min(written, ring.read + self.chunk.slots, (ring.read // ring.slots + 1) * ring.slots)
+            with self.lock:
+                self.count_frames(ring.read, end)
+            ring.read = end
+        self.finished = True
+
+    def count_frames(self, start, end):
+        """Folds ring frames start..end-1 into the counters; called with the lock held.
+
+        The frames are first copied into `chunk` (at most chunk.slots of them, not wrapping past the end of
+        the ring). Any the capture thread had started overwriting by the end of the copy are counted as
+        overruns, so a live capture that laps the aggregator never produces torn frames."""
+        ring, chunk = self.ring, self.chunk
+        slots, snaplen, count = ring.slots, ring.snaplen, end - start
+        first = start % slots
+        chunk.buffer[:count * snaplen] = ring.view[first * snaplen:(first + count) * snaplen]
+        chunk.captured[:count] = ring.captured[first:first + count]
+        chunk.lengths[:count] = ring.lengths[first:first + count]
+        # The capture thread writes sequence s + slots into the slot of s while `written` equals it
+        lapped = min(max(ring.written - slots + 1 - start, 0), count)
+        self.overruns += lapped
+        frames, captured, lengths = chunk.frames, chunk.captured, chunk.lengths
+        link_type, protocols, talkers = self.link_type, self.protocols, self.talkers
+        unpack_u16, unpack_u32, unpack_u64_pair = UNPACK_U16, UNPACK_U32, UNPACK_U64_PAIR
+        total = 0
+        for index in range(lapped, count):
+            frame, size, length = frames[index], captured[index], lengths[index]
+            total += length
+            if link_type == self.RAW_IP:
+                offset = 0
+                ethertype = 0x0800 if size and frame[0] >> 4 == 4 else 0x86DD if size and frame[0] >> 4 == 6 else 0
+            else:
+                offset = 14 if link_type == self.ETHERNET else 16
+                ethertype = unpack_u16(frame, offset - 2)[0] if size >= offset else 0
+                if ethertype == 0x8100 and size >= offset + 4:
+                    ethertype = unpack_u16(frame, offset + 2)[0]
+                    offset += 4
+            if ethertype == 0x0800 and size >= offset + 20:
+                protocol = frame[offset + 9]
+                source = unpack_u32(frame, offset + 12)[0]
+            elif ethertype == 0x86DD and size >= offset + 40:
+                protocol = frame[offset + 6]
+                source = unpack_u64_pair(frame, offset + 8)
+            else:
+                protocols[None] = protocols.get(None, 0) + 1
+                continue
+            protocols[protocol] = protocols.get(protocol, 0) + 1
+            talker = talkers.get(source)
+            if talker is None:
+                talkers[source] = [1, length]
+            else:
+                talker[0] += 1
+                talker[1] += length
+        self.packets += count - lapped
+        self.bytes += total
+        if len(talkers) > CAPTURE_TALKER_LIMIT:
+            # Scans can produce millions of sources; keep the heaviest half so memory stays bounded
+            keep = heapq.nlargest(CAPTURE_TALKER_LIMIT // 2, talkers.items(), key=lambda item: item[1][1])
+            talkers.clear()
+            talkers.update(keep)
+
+    def snapshot(self):
+        if self.record is None and not self.source_done:
+            try:
+                # Reading PACKET_STATISTICS also resets the kernel's counters, so drops are accumulated here
+                _, drops = struct.unpack("II", self.source.getsockopt(SOL_PACKET, PACKET_STATISTICS, 8))
+                self.kernel_drops += drops
+            except OSError:
+                pass
+        with self.lock:
+            top = heapq.nlargest(CAPTURE_TOP_TALKERS, self.talkers.items(), key=lambda item: item[1][1])
+            protocols = sorted(self.protocols.items(), key=lambda item: -item[1])
+            stats = {"packets": self.packets, "bytes": self.bytes, "overruns": self.overruns,
+                     "kernel_drops": self.kernel_drops, "finished": self.finished}
+        stats["talkers"] = [(format_source(source), packets, size) for source, (packets, size) in top]
+        stats["protocols"] = [(self.PROTOCOLS.get(protocol, "Other" if protocol is None else f"IP {protocol}"),
+                               count) for protocol, count in protocols]
+        return stats
+
+
+def format_source(source):
+    """Formats a talker key: an int for IPv4 sources, the address's two 64-bit halves for IPv6."""
+    if isinstance(source, int):
+        return format_address(4, source)
+    return format_address(6, source[0] << 64 | source[1])
+
+
+# Benchmarks
+def run_capture_benchmark(packets):
+    """Replays a synthetic pcap through PacketCapture and reports the sustained packet rate."""
+    record = struct.Struct("<IIII")
+    frame = bytearray(64)  # Ethernet + IPv4 + UDP, source address varied per packet
+    frame[12:14] = b"\x08\x00"
+    frame[14] = 0x45
+    frame[23] = 17
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "bench.pcap")
+        with open(file_path, "wb") as file:
+            file.write(struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 65535, PacketCapture.ETHERNET))
+            for index in range(packets):
+                struct.pack_into("!I", frame, 26, 0x0A000000 + index % 5000)
+                file.write(record.pack(index // 100000, index % 100000 * 10, len(frame), len(frame)))
+                file.write(frame)
+        print(f"Replaying {packets} packets from a synthetic pcap")
+        capture = PacketCapture.from_file(file_path)
+        start = time.perf_counter()
+        capture.start()
+        while not capture.finished:
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - start
+    stats = capture.snapshot()
+    print(f"  Packets counted       : {stats['packets']:>10} ({stats['overruns']} ring overruns)")
+    print(f"  Elapsed               : {elapsed:8.2f}s  {stats['packets'] / elapsed:10,.0f} packets/s")
+    print(f"  Top talker            : {stats['talkers'][0][0]} ({stats['talkers'][0][1]} packets)")
+
+
+def start_stand_in_ssh_server(username, password, auth_delay=0.0, close_on_failure=False, attempts=None,
+                              host_key=None):
+    """Starts a local paramiko SSH server on a random port that only accepts `username`/`password`.
+
+    `auth_delay` is slept inside every password check to stand in for device and WAN latency. With
+    `close_on_failure` the server hangs up after a rejected login, as many devices do, and every
+    username tried is appended to the `attempts` list when one is given. The server presents `host_key`,
+    or a new RSA key when it is None.
+    Returns the port and an Event that shuts the server down when set."""
+    host_key = host_key or paramiko.RSAKey.generate(2048)
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1024)
+    listener.settimeout(0.5)
+    stop = threading.Event()
+
+    class StandInServer(paramiko.ServerInterface):
+        def __init__(self, transport):
+            self.transport = transport
+
+        def get_allowed_auths(self, _username):
+            return "password"
+
+        def check_auth_password(self, _username, _password):
+            time.sleep(auth_delay)
+            if attempts is not None:
+                attempts.append(_username)
+            if _username == username and _password == password:
+                return paramiko.AUTH_SUCCESSFUL
+            if close_on_failure:
+                self.transport.close()  # Hang up at once; the client sees EOF rather than the failure reply
+            return paramiko.AUTH_FAILED
+
+    def serve():
+        while not stop.is_set():
+            try:
+                client, _ = listener.accept()
+            except socket.timeout:
+                continue
+            transport = paramiko.Transport(client)
+            transport.add_server_key(host_key)
+            try:
+                # Passing an event keeps negotiation on the transport's own thread
+                transport.start_server(event=threading.Event(), server=StandInServer(transport))
+            except paramiko.SSHException:
+                transport.close()
+        listener.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    return listener.getsockname()[1], stop
+
+
+def run_worker_pool_baseline(check, queue, threads=8):
+    """The previous App1Frame design: a fixed set of threads each pulling one device at a time."""
+    def worker():
+        while True:
+            try:
+                host = queue.get_nowait()
+            except q.Empty:
+                break
+            check(host)
+
+    threads_list = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in threads_list:
+        thread.start()
+    for thread in threads_list:
+        thread.join()
+
+
+def run_sweep_benchmark(devices, concurrency, auth_delay, fallback=False):
+    port, stop = start_stand_in_ssh_server("bench", "bench", auth_delay)
+    credentials = [("bench", "bench", "TACACS", "Success")]
+    if fallback:
+        # Only the last credential in the chain is accepted, exercising the full TACACS -> DNAC -> local path
+        credentials = [("tacacs", "wrong", "TACACS", "Success"),
+                       ("dnac", "wrong", "RO TACACS", "DNAC authentication Success"),
+                       ("bench", "bench", "Local", "Local authentication Successful")]
+
+    def fill_queue(sentinel):
+        queue = q.Queue()
+        for index in range(devices):
+            queue.put({"Device_Name": f"bench-{index}", "IP_Address": "127.0.0.1", "Port": port})
+        if sentinel:
+            queue.put(SWEEP_DONE)
+        return queue
+
+    print(f"Sweeping {devices} devices against 127.0.0.1:{port} (auth delay {auth_delay}s)")
+    start = time.perf_counter()
+    # The stand-in server makes a new host key each run, so keep its keys out of the real known_hosts file
+    run_worker_pool_baseline(SweepEngine(credentials, host_keys=KnownHostsStore()).connect,
+                             fill_queue(sentinel=False), threads=8)
+    baseline = time.perf_counter() - start
+    print(f"  8-thread worker/queue : {baseline:8.2f}s  {devices / baseline:8.1f} devices/s")
+
+    engine = SweepEngine(credentials, concurrency=concurrency, host_keys=KnownHostsStore())
+    start = time.perf_counter()
+    engine.run(fill_queue(sentinel=True))
+    engine_time = time.perf_counter() - start
+    print(f"  SweepEngine ({concurrency:>4})    : {engine_time:8.2f}s  {devices / engine_time:8.1f} devices/s")
+    print(f"  Speedup               : {baseline / engine_time:8.2f}x")
+    for phase, average in engine.timing_summary().items():
+        print(f"    {phase:<20}: {average * 1000:8.1f}ms average")
+    stop.set()
 
 
 if __name__ == "__main__":
-    app = MainApp()
-    app.mainloop()
+    parser = argparse.ArgumentParser(description="Network Apps")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Benchmark the credential sweep against a local stand-in SSH server and exit")
+    parser.add_argument("--devices", type=int, default=200, help="Devices to sweep in the benchmark")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_SWEEP_CONCURRENCY,
+                        help="SweepEngine concurrency used in the benchmark")
+    parser.add_argument("--auth-delay", type=float, default=0.2,
+                        help="Seconds the stand-in server waits before answering each password check")
+    parser.add_argument("--fallback", action="store_true",
+                        help="Make every benchmark device fall through to the last credential in the chain")
+    parser.add_argument("--capture-benchmark", action="store_true",
+                        help="Benchmark packet capture aggregation on a synthetic pcap and exit")
+    parser.add_argument("--packets", type=int, default=500000, help="Packets in the capture benchmark")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Print how long each import and frame construction takes")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_sweep_benchmark(args.devices, args.concurrency, args.auth_delay, args.fallback)
+    elif args.capture_benchmark:
+        run_capture_benchmark(args.packets)
+    else:
+        startup_profiler.enabled = args.profile_startup
+        with startup_profiler.measure("build MainApp"):
+            app = MainApp()
+        app.after_idle(startup_profiler.report)
+        app.mainloop()
@@ -0,0 +1,21 @@
+import logging
+import os
+import sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# main.py opens Logs/ and Images/ relative to its own directory, as it does when started from there
+sys.path.insert(0, APP_DIR)
+os.chdir(APP_DIR)
+import main  # noqa: E402
+
+# Keep records logged by the code under test out of the app's own log file
+for handler in logging.getLogger().handlers[:]:
+    logging.getLogger().removeHandler(handler)
+
+
+def prefixes(*texts):
+    """(versions, networks, lengths, line numbers) for CIDR strings, as App3Frame's tools receive them."""
+    versions, networks, lengths, line_numbers, invalid = main.parse_prefixes(texts)
+    assert not invalid
+    return versions, networks, lengths, line_numbers
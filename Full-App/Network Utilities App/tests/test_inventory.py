@@ -0,0 +1,36 @@
+import main
+
+ROWS = ("Device_Name,IP_Address,Site,Role\n"
+        "edge-1,10.0.0.1,HQ,Router\ncore-1,10.0.0.2,HQ,Switch\nbad,not-an-ip,HQ,Switch\n")
+
+
+def write_devices(tmp_path, text=ROWS):
+    path = tmp_path / "devices.csv"
+    path.write_text(text)
+    return str(path)
+
+
+def test_swept_file_is_not_parsed_again(tmp_path, monkeypatch):
+    inventory = main.Inventory()
+    file_path = write_devices(tmp_path)
+    assert len(list(inventory.iter_indexed(file_path))) == 3
+    monkeypatch.setattr(main, "iter_devices", lambda path: iter(()))
+    assert inventory.load(file_path) == ["10.0.0.1", "10.0.0.2"]
+    assert inventory.lookup("HQ", "Router") == "10.0.0.1"
+
+
+def test_partly_read_file_is_read_again(tmp_path):
+    inventory = main.Inventory()
+    file_path = write_devices(tmp_path)
+    next(inventory.iter_indexed(file_path))
+    assert inventory.load(file_path) == ["10.0.0.1", "10.0.0.2"]
+
+
+def test_devices_at_filters_by_role(tmp_path):
+    inventory = main.Inventory()
+    inventory.load(write_devices(tmp_path))
+    inventory.add({"Device_Name": "branch-1", "IP_Address": "10.1.0.1"})
+    assert inventory.role_names() == ["Device", "Router", "Switch"]
+    assert [device["Device_Name"] for device in inventory.devices_at(["HQ"], role="Switch")] == ["core-1"]
+    names = [device["Device_Name"] for device in inventory.devices_at(["HQ", "branch-1"])]
+    assert names == ["edge-1", "core-1", "branch-1"]
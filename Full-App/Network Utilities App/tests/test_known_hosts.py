@@ -0,0 +1,81 @@
+import paramiko
+import pytest
+
+import main
+
+DEVICE = {"Device_Name": "switch-1", "IP_Address": "127.0.0.1"}
+CREDENTIALS = [("admin", "admin", "TACACS", "Success")]
+
+
+@pytest.fixture
+def server():
+    host_key = paramiko.RSAKey.generate(2048)
+    port, stop = main.start_stand_in_ssh_server("admin", "admin", host_key=host_key)
+    yield port, host_key
+    stop.set()
+
+
+@pytest.fixture
+def store(monkeypatch):
+    # connect_device's netmiko override checks keys against the module-level store
+    store = main.KnownHostsStore()
+    monkeypatch.setattr(main, "known_hosts", store)
+    return store
+
+
+def sweep(store, port):
+    return main.SweepEngine(CREDENTIALS, host_keys=store).connect({**DEVICE, "Port": port})["Status"]
+
+
+def connect(port):
+    params = dict(main.device_params("127.0.0.1", "admin", "admin"), port=port)
+    main.connect_device(params).disconnect()
+
+
+def test_unknown_host_key_is_learned_on_first_use(server, store):
+    port, host_key = server
+    assert sweep(store, port) == "Success"
+    assert store.pending == [f"[127.0.0.1]:{port} ssh-rsa {host_key.get_base64()}\n"]
+    assert sweep(store, port) == "Success"
+    assert len(store.pending) == 1
+
+
+def test_netmiko_session_learns_host_key_before_login(server, store):
+    port, host_key = server
+    # The stand-in server opens no shell, so the netmiko session stops right after the login
+    with pytest.raises(paramiko.ChannelException):
+        connect(port)
+    assert store.index[f"[127.0.0.1]:{port}"] == {"ssh-rsa": host_key}
+
+
+def test_changed_host_key_is_rejected(server, store):
+    port, _ = server
+    store.verify("127.0.0.1", paramiko.RSAKey.generate(2048), port)
+    assert sweep(store, port) == "Host Key Mismatch"
+    with pytest.raises(paramiko.SSHException, match="does not match"):
+        connect(port)
+
+
+def test_new_key_type_for_a_known_host_is_rejected(store):
+    port, stop = main.start_stand_in_ssh_server("admin", "admin", host_key=paramiko.ECDSAKey.generate())
+    try:
+        store.verify("127.0.0.1", paramiko.RSAKey.generate(2048), port)
+        assert sweep(store, port) == "Host Key Mismatch"
+        with pytest.raises(paramiko.SSHException, match="does not match"):
+            connect(port)
+        assert list(store.index[f"[127.0.0.1]:{port}"]) == ["ssh-rsa"]
+    finally:
+        stop.set()
+
+
+def test_saved_keys_are_trusted_after_reload(server, tmp_path):
+    port, host_key = server
+    path = str(tmp_path / "known_hosts")
+    store = main.KnownHostsStore(path)
+    assert sweep(store, port) == "Success"
+    store.save()
+    reloaded = main.KnownHostsStore(path)
+    assert sweep(reloaded, port) == "Success"
+    assert reloaded.pending == []
+    with pytest.raises(paramiko.BadHostKeyException):
+        reloaded.verify("127.0.0.1", paramiko.RSAKey.generate(2048), port)
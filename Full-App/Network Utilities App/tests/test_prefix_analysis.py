@@ -0,0 +1,71 @@
+import ipaddress
+import random
+
+import pytest
+
+import main
+from conftest import prefixes
+
+
+def address(text):
+    return int(ipaddress.ip_address(text))
+
+
+def test_analyze_reports_duplicates_containment_and_gaps():
+    findings = main.analyze_prefixes(*prefixes("10.0.0.0/8", "10.1.0.0/16", "10.1.0.0/16", "10.2.0.0/24"))
+    assert findings == [
+        ("Gap", 4, address("10.0.0.0"), address("10.0.255.255"), ()),
+        ("Contained", 4, address("10.1.0.0"), address("10.1.255.255"), (0, 1)),
+        ("Duplicate", 4, address("10.1.0.0"), address("10.1.255.255"), (0, 1, 2)),
+        ("Contained", 4, address("10.2.0.0"), address("10.2.0.255"), (0, 3)),
+        ("Gap", 4, address("10.2.1.0"), address("10.255.255.255"), ()),
+    ]
+
+
+def test_analyze_reports_gaps_between_top_level_blocks_only_when_not_adjacent():
+    adjacent = main.analyze_prefixes(*prefixes("192.168.0.0/24", "192.168.1.0/24"))
+    assert adjacent == []
+    apart = main.analyze_prefixes(*prefixes("192.168.0.0/24", "192.168.2.0/24"))
+    assert apart == [("Gap", 4, address("192.168.1.0"), address("192.168.1.255"), ())]
+
+
+def test_analyze_keeps_address_families_apart():
+    findings = main.analyze_prefixes(*prefixes("0.0.0.0/0", "::/0", "2001:db8::/32", "2001:db8::/32"))
+    assert [(kind, version) for kind, version, *_ in findings] == [
+        ("Gap", 6), ("Contained", 6), ("Duplicate", 6), ("Gap", 6)]
+
+
+def test_analyze_chain_lists_every_enclosing_prefix():
+    findings = main.analyze_prefixes(*prefixes("10.0.0.0/8", "10.0.0.0/16", "10.0.0.0/24", "10.0.0.0/30"))
+    contained = [chain for kind, *_, chain in findings if kind == "Contained"]
+    assert contained == [(0, 1), (0, 1, 2), (0, 1, 2, 3)]
+
+
+def test_range_to_prefixes_matches_ipaddress():
+    rng = random.Random(22)
+    for version, bits in ((4, 32), (6, 128)):
+        for _ in range(300):
+            first, last = sorted(rng.getrandbits(bits) >> rng.randrange(bits) for _ in range(2))
+            address_class = ipaddress.IPv4Address if version == 4 else ipaddress.IPv6Address
+            expected = [(int(network.network_address), network.prefixlen) for network in
+                        ipaddress.summarize_address_range(address_class(first), address_class(last))]
+            assert main.range_to_prefixes(version, first, last) == expected
+
+
+def test_range_to_prefixes_edges():
+    assert main.range_to_prefixes(4, 0, 2 ** 32 - 1) == [(0, 0)]
+    assert main.range_to_prefixes(6, 0, 2 ** 128 - 1) == [(0, 0)]
+    assert main.range_to_prefixes(4, 5, 5) == [(5, 32)]
+    assert main.range_to_prefixes(4, 6, 5) == []
+
+
+def test_parse_prefix_matches_ipaddress():
+    for text in ("10.1.2.3/8", "10.1.2.3", "10.0.0.0/08", "10.0.0.0/255.0.0.0", "2001:db8::1/64", "::/0"):
+        network = ipaddress.ip_network(text, strict=False)
+        assert main.parse_prefix(text) == (network.version, int(network.network_address), network.prefixlen)
+
+
+def test_parse_prefix_rejects_malformed_lengths():
+    for text in ("10.0.0.0/", "10.0.0.0/ 8", "10.0.0.0/+8", "10.0.0.0/-1", "10.0.0.0/33", "2001:db8::/", "::/129"):
+        with pytest.raises(ValueError):
+            main.parse_prefix(text)
@@ -0,0 +1,25 @@
+import os
+
+import main
+
+DEVICE = {"Device_Name": "switch-1", "IP_Address": "10.0.0.1", "Status": "Success"}
+
+
+def test_partial_batch_is_written_once_due(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    sink = main.ResultSink("devices.csv", flush_interval=0.5)
+    sink.add(DEVICE)
+    sink.flush_if_due()
+    assert sink.written == 0
+    sink.last_flush -= 1
+    sink.flush_if_due()
+    assert sink.written == 1
+    assert open(sink.path).read().splitlines() == ["Device_Name,IP_Address,Status", "switch-1,10.0.0.1,Success"]
+    sink.close()
+
+
+def test_discard_removes_the_results_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    sink = main.ResultSink("devices.csv")
+    sink.discard()
+    assert not os.path.exists(sink.path)
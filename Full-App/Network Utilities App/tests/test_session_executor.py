@@ -0,0 +1,48 @@
+import pytest
+
+import main
+
+
+class DroppingConnection:
+    """Stands in for a netmiko connection whose session drops during the first command sent on it."""
+
+    def __init__(self, sent):
+        self.sent = sent
+        self.alive = True
+
+    def is_alive(self):
+        return self.alive
+
+    def send_command(self, command):
+        self.sent.append(command)
+        if len(self.sent) == 1:
+            self.alive = False
+            raise OSError("Socket is closed")
+        return command
+
+    def disconnect(self):
+        self.alive = False
+
+
+@pytest.fixture
+def session(monkeypatch):
+    sent = []
+    monkeypatch.setattr(main, "connect_device", lambda params, keepalive=0: DroppingConnection(sent))
+    executor = main.SessionExecutor({"ip": "192.0.2.1"}, keepalive=0)
+    yield executor, sent
+    executor.close()
+
+
+def test_read_only_job_is_resent_after_a_drop(session):
+    executor, sent = session
+    job = executor.submit(lambda connection: connection.send_command("sh version"), timeout=5, retry=True)
+    assert job.wait() == "sh version"
+    assert sent == ["sh version", "sh version"]
+
+
+def test_other_jobs_are_not_resent_after_a_drop(session):
+    executor, sent = session
+    job = executor.submit(lambda connection: connection.send_command("clear counters"), timeout=5)
+    with pytest.raises(ConnectionError, match="not resent"):
+        job.wait()
+    assert sent == ["clear counters"]
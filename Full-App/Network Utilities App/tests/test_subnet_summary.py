@@ -0,0 +1,50 @@
+import ipaddress
+import itertools
+
+import pytest
+
+import main
+from conftest import prefixes
+
+SMALL_PREFIXES = ["2001:db8::/127", "2001:db8::1/128", "2001:db8::/126", "10.0.0.0/31", "10.0.0.1/32", "10.0.0.0/30"]
+EDGE_PREFIXES = ["2001:db8::/64"] + SMALL_PREFIXES
+
+
+def summary(text):
+    network = ipaddress.ip_network(text)
+    return main.subnet_summary(network.version, int(network.network_address), network.prefixlen)
+
+
+@pytest.mark.parametrize("text", SMALL_PREFIXES)
+def test_subnet_summary_matches_ipaddress_hosts(text):
+    network = ipaddress.ip_network(text)
+    hosts = [int(host) for host in network.hosts()]
+    broadcast = int(network.broadcast_address) if network.version == 4 else None
+    assert summary(text) == (int(network.netmask), broadcast, len(hosts), hosts[0], hosts[-1])
+
+
+def test_subnet_summary_ipv6_64():
+    network = ipaddress.ip_network("2001:db8::/64")
+    first = next(network.hosts())
+    assert summary("2001:db8::/64") == (int(network.netmask), None, network.num_addresses - 1, int(first),
+                                        int(network.broadcast_address))
+
+
+@pytest.mark.parametrize("text", EDGE_PREFIXES)
+def test_summarize_prefixes_matches_subnet_summary(text):
+    versions, networks, lengths, _ = prefixes(text)
+    columns = main.summarize_prefixes(versions, networks, lengths)
+    assert tuple(column[0] for column in columns) == main.subnet_summary(versions[0], networks[0], lengths[0])
+
+
+@pytest.mark.parametrize("text", EDGE_PREFIXES)
+def test_iter_hosts_matches_ipaddress(text):
+    network = ipaddress.ip_network(text)
+    hosts = main.iter_hosts(network.version, int(network.network_address), network.prefixlen)
+    assert list(itertools.islice(hosts, 3)) == [str(host) for host in itertools.islice(network.hosts(), 3)]
+
+
+def test_iter_hosts_offset_reaches_the_last_usable_address():
+    network = ipaddress.ip_network("2001:db8::/64")
+    hosts = main.iter_hosts(6, int(network.network_address), 64, offset=network.num_addresses - 3)
+    assert list(hosts) == [str(network.broadcast_address - 1), str(network.broadcast_address)]
@@ -0,0 +1,71 @@
+import ipaddress
+import random
+
+import pytest
+
+import main
+from conftest import prefixes
+
+
+def random_networks(rng, version, count):
+    base = ipaddress.ip_network("10.0.0.0/8" if version == 4 else "2001:db8::/32")
+    networks = []
+    for _ in range(count):
+        # Blocks of up to 1024 addresses packed into 4096, so many of them overlap or touch
+        value = int(base.network_address) + rng.getrandbits(12)
+        networks.append(type(base)((value, rng.randrange(base.max_prefixlen - 10, base.max_prefixlen + 1)),
+                                   strict=False))
+    return networks
+
+
+def test_collapse_matches_ipaddress():
+    rng = random.Random(24)
+    for version in (4, 6):
+        for _ in range(50):
+            networks = random_networks(rng, version, 40)
+            versions, starts, lengths, _ = prefixes(*(str(network) for network in networks))
+            expected = [(version, int(network.network_address), network.prefixlen)
+                        for network in ipaddress.collapse_addresses(networks)]
+            assert main.collapse_prefixes(versions, starts, lengths) == expected
+
+
+def test_collapse_merges_adjacent_and_keeps_families_apart():
+    versions, networks, lengths, _ = prefixes("10.0.1.0/24", "10.0.0.0/24", "10.0.0.0/25", "::/1", "8000::/1")
+    collapsed = main.collapse_prefixes(versions, networks, lengths)
+    assert collapsed == [(4, int(ipaddress.ip_address("10.0.0.0")), 23), (6, 0, 0)]
+
+
+def usable_hosts(length):
+    return 1 if length == 32 else 2 if length == 31 else 2 ** (32 - length) - 2
+
+
+def test_required_prefix_length_is_the_longest_that_fits():
+    for hosts in range(0, 5000):
+        length = main.required_prefix_length(4, hosts)
+        assert usable_hosts(length) >= max(hosts, 1)
+        assert length == 32 or usable_hosts(length + 1) < hosts
+
+
+def test_plan_vlsm_places_largest_first_and_aligned():
+    network = int(ipaddress.ip_address("10.0.0.0"))
+    plan, free = main.plan_vlsm(4, network, 22, [("users", 200), ("servers", 500), ("link", 2), ("voice", 60)])
+    assert [(name, length) for name, _, length, _ in plan] == [
+        ("servers", 23), ("users", 24), ("voice", 26), ("link", 31)]
+    subnets = [ipaddress.ip_network((start, length)) for _, _, length, start in plan]  # Raises if misaligned
+    assert all(subnet.subnet_of(ipaddress.ip_network("10.0.0.0/22")) for subnet in subnets)
+    assert not any(a.overlaps(b) for index, a in enumerate(subnets) for b in subnets[index + 1:])
+    assert free == (int(ipaddress.ip_address("10.0.3.66")), int(ipaddress.ip_address("10.0.3.255")))
+
+
+def test_plan_vlsm_marks_subnets_that_do_not_fit():
+    network = int(ipaddress.ip_address("192.168.0.0"))
+    plan, free = main.plan_vlsm(4, network, 24, [("a", 200), ("b", 100)])
+    assert plan == [("a", 200, 24, network), ("b", 100, 25, None)]
+    assert free is None
+
+
+def test_plan_vlsm_rejects_host_counts_below_one():
+    network = int(ipaddress.ip_address("192.168.0.0"))
+    for hosts in (0, -5):
+        with pytest.raises(ValueError, match="at least 1"):
+            main.plan_vlsm(4, network, 24, [("a", 10), ("b", hosts)])
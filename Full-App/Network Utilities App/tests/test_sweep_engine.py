@@ -0,0 +1,34 @@
+import pytest
+
+import main
+
+CREDENTIALS = [("tacacs", "wrong", "TACACS", "Success"),
+               ("dnac", "wrong", "RO TACACS", "DNAC authentication Success"),
+               ("localuser", "local", "Local", "Local authentication Successful")]
+
+
+@pytest.mark.parametrize("close_on_failure", [False, True])
+def test_fallback_sends_each_credential_once(close_on_failure):
+    attempts = []
+    port, stop = main.start_stand_in_ssh_server("localuser", "local", close_on_failure=close_on_failure,
+                                                attempts=attempts)
+    try:
+        # An in-memory host key store, so the stand-in server's throwaway key stays out of known_hosts
+        engine = main.SweepEngine(CREDENTIALS, host_keys=main.KnownHostsStore())
+        result = engine.connect({"Device_Name": "switch-1", "IP_Address": "127.0.0.1", "Port": port})
+    finally:
+        stop.set()
+    assert result["Status"] == "Local authentication Successful"
+    assert attempts == ["tacacs", "dnac", "localuser"]
+
+
+def test_every_credential_rejected_is_reported_as_a_failure():
+    attempts = []
+    port, stop = main.start_stand_in_ssh_server("nobody", "nothing", close_on_failure=True, attempts=attempts)
+    try:
+        engine = main.SweepEngine(CREDENTIALS, host_keys=main.KnownHostsStore())
+        result = engine.connect({"Device_Name": "switch-1", "IP_Address": "127.0.0.1", "Port": port})
+    finally:
+        stop.set()
+    assert result["Status"] == "TACACS/Local authentication Failure"
+    assert attempts == ["tacacs", "dnac", "localuser"]
@@ -0,0 +1,65 @@
+import pytest
+
+import main
+
+DEVICES = [{"Device_Name": f"switch-{index}", "IP_Address": f"10.0.0.{index}", "Status": "Success"}
+           for index in range(1, 4)]
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    # SweepJournal writes under Results/ in the working directory
+    monkeypatch.chdir(tmp_path)
+    return str(tmp_path / "devices.csv")
+
+
+def write_journal(source, devices):
+    journal = main.SweepJournal(source)
+    for device in devices:
+        journal.record(device)
+    journal.close()
+    return journal.path
+
+
+def test_resume_skips_recorded_devices(source):
+    write_journal(source, DEVICES[:2])
+    journal = main.SweepJournal(source, resume=True)
+    assert journal.status(DEVICES[0]) == "Success"
+    assert journal.status(DEVICES[2]) is None
+    assert journal.skipped == 1
+    journal.close()
+
+
+def test_fresh_sweep_starts_an_empty_journal(source):
+    path = write_journal(source, DEVICES)
+    journal = main.SweepJournal(source)
+    journal.close()
+    assert journal.status(DEVICES[0]) is None
+    assert open(path).read() == ""
+
+
+def test_torn_last_line_is_truncated_on_resume(source):
+    path = write_journal(source, DEVICES[:1])
+    with open(path, "a") as journal_file:
+        journal_file.write("switch-2,10.0.0.2,Succ")  # Crash in the middle of a write
+    journal = main.SweepJournal(source, resume=True)
+    assert list(journal.completed) == [("switch-1", "10.0.0.1")]
+    journal.record(DEVICES[2])
+    journal.close()
+    assert open(path).read() == "switch-1,10.0.0.1,Success\nswitch-3,10.0.0.3,Success\n"
+
+
+def test_torn_line_longer_than_a_scan_block_is_truncated(source):
+    path = write_journal(source, DEVICES[:1])
+    with open(path, "a") as journal_file:
+        journal_file.write("x" * (main.JOURNAL_SCAN_BYTES * 2 + 7))
+    main.SweepJournal(source, resume=True).close()
+    assert open(path).read() == "switch-1,10.0.0.1,Success\n"
+
+
+def test_journal_in_use_cannot_be_reopened(source):
+    journal = main.SweepJournal(source)
+    with pytest.raises(OSError):
+        main.SweepJournal(source)
+    journal.close()
+    main.SweepJournal(source).close()